@@ -1,9 +1,11 @@
-
 from __future__ import annotations
 
 import argparse
+import json
+from collections.abc import Iterator
 
-from core import Order, process_orders_pure
+from core import SUMMATIONS, Order, make_processor, policy_spec, process_orders_stream
+from parallel import make_parallel_processor
 
 
 def sample_orders() -> list[Order]:
@@ -18,19 +20,63 @@ def sample_orders() -> list[Order]:
     ]
 
 
+def read_ndjson(path: str) -> Iterator[Order]:
+    """Ліниво читати замовлення з NDJSON (один JSON-об'єкт на рядок)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--min-total", type=float, default=100.0)
     parser.add_argument("--discount", type=float, default=0.1)
     parser.add_argument("--tax", type=float, default=0.2)
+    parser.add_argument(
+        "--ndjson",
+        metavar="PATH",
+        help="потоково обробити замовлення з NDJSON-файлу (пам'ять O(1))",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="обробити шарди замовлень у N процесах",
+    )
+    parser.add_argument(
+        "--summation",
+        choices=sorted(SUMMATIONS),
+        default="float",
+        help="стратегія підсумовування subtotal/revenue",
+    )
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers має бути ≥ 1")
+    if args.ndjson and args.workers > 1:
+        parser.error("--workers не поєднується з --ndjson (потоковий режим)")
 
-    result = process_orders_pure(
-        sample_orders(),
-        min_total=args.min_total,
-        discount=args.discount,
-        tax_rate=args.tax,
-    )
+    summation = SUMMATIONS[args.summation]
+    if args.ndjson:
+        stream = process_orders_stream(
+            read_ndjson(args.ndjson),
+            min_total=args.min_total,
+            discount=args.discount,
+            tax_rate=args.tax,
+            summation=summation,
+        )
+        for o in stream:
+            print(f"Processed id={o['id']} total={o['total']:.2f}")
+        print(f"Revenue: {stream.revenue:.2f} Count: {stream.count}")
+        return
+
+    spec = policy_spec(args.min_total, args.discount, args.tax)
+    if args.workers > 1:
+        process = make_parallel_processor(spec, workers=args.workers, summation=summation)
+    else:
+        process = make_processor(*spec, summation=summation)
+    result = process(sample_orders())
 
     for o in result["orders"]:
         print(f"Processed id={o['id']} total={o['total']:.2f}")
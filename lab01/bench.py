@@ -0,0 +1,128 @@
+"""
+Мікробенчмарки конвеєра замовлень.
+
+    python bench.py                  # усі сценарії
+    python bench.py --orders 200000  # більший пакет
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from collections.abc import Callable
+from functools import partial
+
+import columnar
+import core
+
+
+def make_orders(n: int, seed: int = 0) -> list[core.Order]:
+    rnd = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "paid": rnd.random() < 0.8,
+            "items": [
+                {"price": round(rnd.uniform(1.0, 100.0), 2), "qty": rnd.randint(1, 5)}
+                for _ in range(rnd.randint(1, 6))
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def closure_chain_processor(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+) -> Callable[[list[core.Order]], core.Result]:
+    """Вихідна реалізація make_processor: три виклики замикань на замовлення."""
+
+    def process(orders: list[core.Order]) -> core.Result:
+        processed: list[core.ProcessedOrder] = []
+        for o in orders:
+            if not o.get("paid"):
+                continue
+            s = core.subtotal(o)
+            if not accept(s):
+                continue
+            processed.append({"id": o["id"], "total": apply_tax(apply_discount(s))})
+        revenue = sum(p["total"] for p in processed)
+        return {"orders": processed, "revenue": revenue, "count": len(processed)}
+
+    return process
+
+
+def report(label: str, fn: Callable[[], object], repeat: int, n: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"  {label:<32} {best * 1e3:9.2f} ms  {best / n * 1e9:8.1f} ns/item")
+    return best
+
+
+def bench_policies(orders: list[core.Order], repeat: int) -> None:
+    print(f"policies ({len(orders)} orders)")
+    lambdas = (lambda s: s >= 100.0, lambda s: s * (1 - 0.1), lambda a: a * (1 + 0.2))
+    builtin = (
+        core.accept_min_total(100.0),
+        core.apply_discount_rate(0.1),
+        core.apply_tax_rate(0.2),
+    )
+    baseline = closure_chain_processor(*lambdas)
+    fused = core.make_processor(*builtin)
+    assert baseline(orders) == fused(orders)
+
+    base = report("closure chain (baseline)", lambda: baseline(orders), repeat, len(orders))
+    t = report(
+        "make_processor, lambdas",
+        lambda: core.make_processor(*lambdas)(orders),
+        repeat,
+        len(orders),
+    )
+    print(f"    vs baseline: x{base / t:.2f}")
+    best = report("make_processor, fused built-ins", lambda: fused(orders), repeat, len(orders))
+    print(f"    vs baseline: x{base / best:.2f}")
+    if columnar.HAVE_NUMPY:
+        batch = columnar.make_columnar_processor(*builtin)
+        report("columnar, list of dicts", lambda: batch(orders), repeat, len(orders))
+        report(
+            "  of which flatten_orders",
+            lambda: columnar.flatten_orders(orders),
+            repeat,
+            len(orders),
+        )
+        cols = columnar.flatten_orders(orders)
+        settle = columnar.make_columns_processor(*builtin)
+        assert settle(cols) == baseline(orders)
+        best = min(
+            best, report("columnar, prebuilt columns", lambda: settle(cols), repeat, len(orders))
+        )
+    print(f"  best speedup vs baseline: x{base / best:.2f}")
+
+
+def bench_summation(orders: list[core.Order], repeat: int) -> None:
+    rnd = random.Random(1)
+    values = [rnd.uniform(0.01, 1e4) for _ in range(len(orders) * 10)]
+    print(f"summation ({len(values)} floats)")
+    for name, summation in core.SUMMATIONS.items():
+        report(name, partial(summation, values), repeat, len(values))
+    print(f"make_processor by summation ({len(orders)} orders)")
+    spec = core.policy_spec(100.0, 0.1, 0.2)
+    for name, summation in core.SUMMATIONS.items():
+        process = core.make_processor(*spec, summation=summation)
+        report(name, partial(process, orders), repeat, len(orders))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders)
+    bench_policies(orders, args.repeat)
+    bench_summation(orders, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
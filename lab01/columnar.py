@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from itertools import chain, compress
+from operator import itemgetter
+from typing import Any, NamedTuple, cast
+
+from core import (
+    DiscountRate,
+    MinTotal,
+    Order,
+    ProcessedOrder,
+    Result,
+    Summation,
+    TaxRate,
+    make_processor,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy опційний
+    np = None  # type: ignore[assignment]
+
+HAVE_NUMPY = np is not None
+
+# Починаючи з 3.12 вбудований sum для float використовує компенсоване
+# підсумовування (Ноймаєр), тож сегментна редукція мусить його відтворити,
+# щоб subtotal збігався зі скалярним побітово.
+_COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+_get_id = itemgetter("id")
+_get_items = itemgetter("items")
+_get_price = itemgetter("price")
+_get_qty = itemgetter("qty")
+
+
+# === Колонкове представлення ==================================================
+
+class OrderColumns(NamedTuple):
+    """Оплачені замовлення, розгорнуті в паралельні масиви."""
+
+    ids: list[Any]  # id як є (без приведення до int64)
+    prices: Any  # float64[n_items]
+    qtys: Any  # float64[n_items]: price * qty у float64 == float * int у Python
+    offsets: Any  # intp[n_orders + 1]: товари i-го замовлення — offsets[i]:offsets[i+1]
+
+
+def flatten_orders(orders: list[Order]) -> OrderColumns:
+    """Розгорнути оплачені замовлення в колонки price/qty/offsets."""
+    paid = [o for o in orders if o.get("paid")]
+    item_lists = list(map(_get_items, paid))
+    items = list(chain.from_iterable(item_lists))
+    offsets = np.zeros(len(paid) + 1, dtype=np.intp)
+    np.cumsum(np.fromiter(map(len, item_lists), dtype=np.intp, count=len(paid)), out=offsets[1:])
+    return OrderColumns(
+        ids=list(map(_get_id, paid)),
+        prices=np.fromiter(map(_get_price, items), dtype=np.float64, count=len(items)),
+        qtys=np.fromiter(map(_get_qty, items), dtype=np.float64, count=len(items)),
+        offsets=offsets,
+    )
+
+
+def segment_sums(values: Any, offsets: Any) -> Any:
+    """
+    Суми сегментів values[offsets[i]:offsets[i+1]].
+
+    Кожен сегмент підсумовується зліва направо тим самим алгоритмом, що й
+    вбудований sum, тому результат побітово збігається зі скалярним subtotal.
+    Сегменти впорядковуються за спаданням довжини: j-й крок торкається лише
+    префікса з сегментів, довших за j, — разом O(len(values) + max_len).
+    """
+    starts = offsets[:-1]
+    lengths = np.diff(offsets)
+    n = len(lengths)
+    out = np.zeros(n, dtype=np.float64)
+    if n == 0 or not lengths.any():
+        return out
+
+    by_len = np.argsort(-lengths, kind="stable")
+    starts = starts[by_len]
+    neg_lengths = -lengths[by_len]  # за зростанням → searchsorted
+    s = np.zeros(n, dtype=np.float64)
+    c = np.zeros(n, dtype=np.float64)
+
+    with np.errstate(all="ignore"):
+        for j in range(int(-neg_lengths[0])):
+            m = int(np.searchsorted(neg_lengths, -j, side="left"))
+            x = values[starts[:m] + j]
+            head = s[:m]
+            if j == 0 or not _COMPENSATED_SUM:
+                head += x
+                continue
+            t = head + x
+            c[:m] += np.where(np.abs(head) >= np.abs(x), (head - t) + x, (x - t) + head)
+            s[:m] = t
+        if _COMPENSATED_SUM:
+            fix = (c != 0) & np.isfinite(c)
+            s[fix] += c[fix]
+
+    out[by_len] = s
+    return out
+
+
+# === Колонковий конвеєр =======================================================
+
+def _is_vectorizable(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+) -> bool:
+    return (
+        isinstance(accept, MinTotal)
+        and isinstance(apply_discount, DiscountRate)
+        and isinstance(apply_tax, TaxRate)
+    )
+
+
+def make_columns_processor(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+) -> Callable[[OrderColumns], Result]:
+    """
+    Обробник готових колонок: process(cols) -> Result.
+
+    Колонки будуються один раз через flatten_orders і перевикористовуються
+    між запусками розрахунку — саме розгортання списку словників і є
+    найдорожчою частиною колонкового режиму. subtotal рахується сегментною
+    редукцією (як вбудований sum); вбудовані політики застосовуються
+    векторно, довільні callable — по одному subtotal, тож Result побітово
+    збігається з make_processor. Потребує NumPy.
+    """
+    if not HAVE_NUMPY:
+        raise RuntimeError("make_columns_processor потребує NumPy")
+
+    if _is_vectorizable(accept, apply_discount, apply_tax):
+        min_total = cast(MinTotal, accept).min_total
+        discount_factor = 1 - cast(DiscountRate, apply_discount).rate
+        tax_factor = 1 + cast(TaxRate, apply_tax).rate
+
+        def settle(subtotals: Any) -> tuple[list[bool], list[float]]:
+            keep = subtotals >= min_total
+            totals: list[float] = ((subtotals[keep] * discount_factor) * tax_factor).tolist()
+            return keep.tolist(), totals
+
+    else:
+
+        def settle(subtotals: Any) -> tuple[list[bool], list[float]]:
+            keep = [accept(s) for s in subtotals.tolist()]
+            totals = [
+                apply_tax(apply_discount(s))
+                for s, k in zip(subtotals.tolist(), keep, strict=True)
+                if k
+            ]
+            return keep, totals
+
+    def process(cols: OrderColumns) -> Result:
+        subtotals = segment_sums(cols.prices * cols.qtys, cols.offsets)
+        keep, totals = settle(subtotals)
+        ids = compress(cols.ids, keep)
+        processed: list[ProcessedOrder] = [
+            {"id": i, "total": t} for i, t in zip(ids, totals, strict=True)
+        ]
+        revenue = sum(totals)
+        return {"orders": processed, "revenue": revenue, "count": len(processed)}
+
+    return process
+
+
+def make_columnar_processor(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+    *,
+    summation: Summation = sum,
+) -> Callable[[list[Order]], Result]:
+    """
+    Те саме, що make_processor, але пакетом над масивами NumPy.
+
+    Зручна обгортка: на кожен виклик розгортає список словників у колонки
+    (flatten_orders) і передає їх make_columns_processor. Розгортання коштує
+    більше, ніж сам розрахунок, тому для повторних запусків над тими самими
+    замовленнями слід будувати OrderColumns один раз. Векторизуються лише
+    вбудовані політики (MinTotal, DiscountRate, TaxRate) з підсумовуванням
+    за замовчуванням (sum); інакше, а також без NumPy, повертається
+    звичайний скалярний make_processor.
+    """
+    if summation is not sum or not (
+        HAVE_NUMPY and _is_vectorizable(accept, apply_discount, apply_tax)
+    ):
+        return make_processor(accept, apply_discount, apply_tax, summation=summation)
+
+    settle = make_columns_processor(accept, apply_discount, apply_tax)
+
+    def process(orders: list[Order]) -> Result:
+        return settle(flatten_orders(orders))
+
+    return process
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import TypedDict
+import math
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import NamedTuple, TypedDict
 
 
 # === Типи даних ===============================================================
@@ -28,32 +31,390 @@ class Result(TypedDict):
     count: int
 
 
+# === Стратегії підсумовування =================================================
+#
+# Усі агрегації (subtotal, revenue, merge_results) приймають стратегію
+# summation: функцію iterable[float] -> float. За замовчуванням — вбудований sum.
+
+Summation = Callable[[Iterable[float]], float]
+
+# Починаючи з 3.12 вбудований sum для float — компенсований (Ноймаєр).
+_COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+def neumaier_sum(xs: Iterable[float]) -> float:
+    """Компенсована сума Кехена–Бабушки (Ноймаєра): похибка O(1) ulp замість O(n)."""
+    s = 0.0
+    c = 0.0
+    for x in xs:
+        t = s + x
+        if abs(s) >= abs(x):
+            c += (s - t) + x
+        else:
+            c += (x - t) + s
+        s = t
+    return s + c
+
+
+def cents_sum(xs: Iterable[float]) -> float:
+    """Фіксована кома: кожне значення округлюється до цілих центів, сума — точна в int."""
+    return sum(round(x * 100) for x in xs) / 100
+
+
+# Незалежні від порядку і розбиття на шарди: "fsum" (точне округлення
+# математичної суми) і "cents" (цілочисельна сума). "neumaier" лише
+# зменшує похибку; "float" — поведінка за замовчуванням.
+SUMMATIONS: dict[str, Summation] = {
+    "float": sum,
+    "neumaier": neumaier_sum,
+    "fsum": math.fsum,
+    "cents": cents_sum,
+}
+
+
+# Поточні (потокові) варіанти тих самих стратегій: add(x) по одному значенню,
+# value — сума на цей момент. Пам'ять O(1) (для "fsum" — кілька часткових сум),
+# а результат побітово дорівнює summation над тією ж послідовністю.
+
+
+class FloatRunningSum:
+    """Послідовне додавання; з compensated=True — як вбудований sum з 3.12."""
+
+    __slots__ = ("_s", "_c", "_compensated")
+
+    def __init__(self, compensated: bool = False) -> None:
+        self._s = 0.0
+        self._c = 0.0
+        self._compensated = compensated
+
+    def add(self, x: float) -> None:
+        if not self._compensated:
+            self._s += x
+            return
+        s = self._s
+        t = s + x
+        if abs(s) >= abs(x):
+            self._c += (s - t) + x
+        else:
+            self._c += (x - t) + s
+        self._s = t
+
+    @property
+    def value(self) -> float:
+        c = self._c
+        # як у CPython: поправка не перетворює inf/переповнення на nan
+        return self._s + c if c and math.isfinite(c) else self._s
+
+
+class NeumaierRunningSum:
+    """Поточний варіант neumaier_sum."""
+
+    __slots__ = ("_s", "_c")
+
+    def __init__(self) -> None:
+        self._s = 0.0
+        self._c = 0.0
+
+    def add(self, x: float) -> None:
+        s = self._s
+        t = s + x
+        if abs(s) >= abs(x):
+            self._c += (s - t) + x
+        else:
+            self._c += (x - t) + s
+        self._s = t
+
+    @property
+    def value(self) -> float:
+        return self._s + self._c
+
+
+class ExactRunningSum:
+    """Поточний варіант math.fsum: точні часткові суми Шевчука, що не перекриваються."""
+
+    __slots__ = ("_partials", "_special")
+
+    def __init__(self) -> None:
+        self._partials: list[float] = []
+        self._special = 0.0  # inf/nan окремо, як у fsum
+
+    def add(self, x: float) -> None:
+        if not math.isfinite(x):
+            self._special += x
+            return
+        partials = self._partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    @property
+    def value(self) -> float:
+        if self._special or math.isnan(self._special):
+            return self._special
+        return math.fsum(self._partials)
+
+
+class CentsRunningSum:
+    """Поточний варіант cents_sum: ціле число центів."""
+
+    __slots__ = ("_cents",)
+
+    def __init__(self) -> None:
+        self._cents = 0
+
+    def add(self, x: float) -> None:
+        self._cents += round(x * 100)
+
+    @property
+    def value(self) -> float:
+        return self._cents / 100
+
+
+RunningSum = FloatRunningSum | NeumaierRunningSum | ExactRunningSum | CentsRunningSum
+
+
+def running_sum(summation: Summation) -> RunningSum:
+    """Поточний акумулятор, що дає той самий результат, що й summation."""
+    if summation is sum:
+        return FloatRunningSum(compensated=_COMPENSATED_SUM)
+    if summation is neumaier_sum:
+        return NeumaierRunningSum()
+    if summation is math.fsum:
+        return ExactRunningSum()
+    if summation is cents_sum:
+        return CentsRunningSum()
+    raise ValueError(f"немає потокового варіанта для стратегії {summation!r}")
+
+
 # === Чисті утиліти ============================================================
 
-def subtotal(order: Order) -> float:
+def subtotal(order: Order, summation: Summation = sum) -> float:
     """Сума по товарах (без знижок і податків)."""
-    return sum(item["price"] * item["qty"] for item in order["items"])
+    return summation(item["price"] * item["qty"] for item in order["items"])
 
 
 # === Будівники політик (higher-order functions) ===============================
+#
+# Будівники повертають не анонімні лямбди, а маленькі незмінні callable-об'єкти:
+# їх можна викликати як звичайні функції, але параметр політики лишається
+# доступним (наприклад, для колонкового режиму в columnar.py).
+
+@dataclass(frozen=True, slots=True)
+class MinTotal:
+    """Політика прийому: subtotal ≥ min_total."""
 
-def accept_min_total(min_total: float) -> Callable[[float], bool]:
+    min_total: float
+
+    def __call__(self, s: float) -> bool:
+        return s >= self.min_total
+
+
+@dataclass(frozen=True, slots=True)
+class DiscountRate:
+    """Політика знижки: s * (1 - rate)."""
+
+    rate: float
+
+    def __call__(self, s: float) -> float:
+        return s * (1 - self.rate)
+
+
+@dataclass(frozen=True, slots=True)
+class TaxRate:
+    """Політика податку: a * (1 + rate)."""
+
+    rate: float
+
+    def __call__(self, a: float) -> float:
+        return a * (1 + self.rate)
+
+
+def accept_min_total(min_total: float) -> MinTotal:
     """Приймати замовлення з subtotal ≥ min_total."""
-    return lambda s: s >= min_total
+    return MinTotal(min_total)
 
 
-def apply_discount_rate(rate: float) -> Callable[[float], float]:
+def apply_discount_rate(rate: float) -> DiscountRate:
     """Знижка rate (0.1 = 10%)."""
-    def _apply(s: float) -> float:
-        return s * (1 - rate)
-    return _apply
+    return DiscountRate(rate)
 
 
-def apply_tax_rate(rate: float) -> Callable[[float], float]:
+def apply_tax_rate(rate: float) -> TaxRate:
     """Податок rate (0.2 = 20%)."""
-    def _apply(a: float) -> float:
-        return a * (1 + rate)
-    return _apply
+    return TaxRate(rate)
+
+
+class PolicySpec(NamedTuple):
+    """
+    Повний набір політик конвеєра як звичайні дані.
+
+    Зі вбудованими політиками spec серіалізується pickle, тож його можна
+    передати у воркери ProcessPoolExecutor (див. parallel.py).
+    """
+
+    accept: Callable[[float], bool]
+    apply_discount: Callable[[float], float]
+    apply_tax: Callable[[float], float]
+
+
+def policy_spec(min_total: float, discount: float, tax_rate: float) -> PolicySpec:
+    """Типова політика: поріг, знижка і податок як ставки."""
+    return PolicySpec(
+        accept=accept_min_total(min_total),
+        apply_discount=apply_discount_rate(discount),
+        apply_tax=apply_tax_rate(tax_rate),
+    )
+
+
+# === Компіляція політик =======================================================
+
+# Один крок конвеєра: замовлення → оброблене замовлення або None (відкинуто).
+OrderStep = Callable[[Order], ProcessedOrder | None]
+# Пакетний варіант: замовлення → оброблені (відкинуті пропускаються).
+OrderBatch = Callable[[Iterable[Order]], list[ProcessedOrder]]
+
+
+def _builtin_factors(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+) -> tuple[float, float, float] | None:
+    """(поріг, 1 - d, 1 + t) для вбудованих політик або None для довільних callable."""
+    if (
+        isinstance(accept, MinTotal)
+        and isinstance(apply_discount, DiscountRate)
+        and isinstance(apply_tax, TaxRate)
+    ):
+        return accept.min_total, 1 - apply_discount.rate, 1 + apply_tax.rate
+    return None
+
+
+def compile_batch(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+    *,
+    summation: Summation = sum,
+) -> OrderBatch:
+    """
+    Злити ланцюжок paid → subtotal → accept → знижка → податок в один цикл.
+
+    Варіант циклу обирається один раз, під час компіляції, тож усередині
+    немає перевірок на кожне замовлення. Вбудовані політики (MinTotal,
+    DiscountRate, TaxRate) стають готовим порогом і двома множниками:
+    s * (1 - d) * (1 + t) у тому ж порядку множень, тож результат не
+    відрізняється від виклику замикань. Для вбудованого sum до 3.12 subtotal
+    рахується простим циклом без проміжного списку. Довільні callable
+    викликаються як є, subtotal — стратегією summation.
+    """
+    factors = _builtin_factors(accept, apply_discount, apply_tax)
+    # Вбудований sum до 3.12 додає зліва направо без компенсації — той самий
+    # результат дає простий цикл, без окремого списку на замовлення.
+    inline_sum = summation is sum and not _COMPENSATED_SUM
+
+    if factors is not None and inline_sum:
+        lo, df, tf = factors
+
+        def settle_inline(orders: Iterable[Order]) -> list[ProcessedOrder]:
+            processed: list[ProcessedOrder] = []
+            append = processed.append
+            for o in orders:
+                if not o.get("paid"):
+                    continue
+                s: float = 0
+                for item in o["items"]:
+                    s += item["price"] * item["qty"]
+                if s >= lo:
+                    append({"id": o["id"], "total": s * df * tf})
+            return processed
+
+        return settle_inline
+
+    if factors is not None:
+        lo, df, tf = factors
+
+        def settle_factors(orders: Iterable[Order]) -> list[ProcessedOrder]:
+            processed: list[ProcessedOrder] = []
+            append = processed.append
+            for o in orders:
+                if not o.get("paid"):
+                    continue
+                s = summation([item["price"] * item["qty"] for item in o["items"]])
+                if s >= lo:
+                    append({"id": o["id"], "total": s * df * tf})
+            return processed
+
+        return settle_factors
+
+    def settle(orders: Iterable[Order]) -> list[ProcessedOrder]:
+        processed: list[ProcessedOrder] = []
+        append = processed.append
+        for o in orders:
+            if not o.get("paid"):
+                continue
+            s = summation([item["price"] * item["qty"] for item in o["items"]])
+            if accept(s):
+                append({"id": o["id"], "total": apply_tax(apply_discount(s))})
+        return processed
+
+    return settle
+
+
+def compile_policies(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+    *,
+    summation: Summation = sum,
+) -> OrderStep:
+    """
+    Покроковий варіант compile_batch для потоків та інкрементального індексу.
+
+    Ті самі спеціалізації і той самий порядок операцій, але одне замовлення
+    на виклик, без проміжних кортежів чи списків результатів.
+    """
+    factors = _builtin_factors(accept, apply_discount, apply_tax)
+    inline_sum = summation is sum and not _COMPENSATED_SUM
+
+    if factors is not None and inline_sum:
+        lo, df, tf = factors
+
+        def step_inline(o: Order) -> ProcessedOrder | None:
+            if not o.get("paid"):
+                return None
+            s: float = 0
+            for item in o["items"]:
+                s += item["price"] * item["qty"]
+            return {"id": o["id"], "total": s * df * tf} if s >= lo else None
+
+        return step_inline
+
+    if factors is not None:
+        lo, df, tf = factors
+
+        def step_factors(o: Order) -> ProcessedOrder | None:
+            if not o.get("paid"):
+                return None
+            s = summation([item["price"] * item["qty"] for item in o["items"]])
+            return {"id": o["id"], "total": s * df * tf} if s >= lo else None
+
+        return step_factors
+
+    def step(o: Order) -> ProcessedOrder | None:
+        if not o.get("paid"):
+            return None
+        s = summation([item["price"] * item["qty"] for item in o["items"]])
+        return {"id": o["id"], "total": apply_tax(apply_discount(s))} if accept(s) else None
+
+    return step
 
 
 # === Конвеєр обробки ==========================================================
@@ -62,6 +423,8 @@ def make_processor(
     accept: Callable[[float], bool],
     apply_discount: Callable[[float], float],
     apply_tax: Callable[[float], float],
+    *,
+    summation: Summation = sum,
 ) -> Callable[[list[Order]], Result]:
     """
     Повертає чисту функцію process(orders) -> Result.
@@ -72,23 +435,88 @@ def make_processor(
       3) accept(subtotal);
       4) знижка → податок;
       5) підсумок revenue і count.
+
+    Кроки 1–4 компілюються один раз (див. compile_batch); subtotal і
+    revenue підсумовуються стратегією summation.
     """
+    settle = compile_batch(accept, apply_discount, apply_tax, summation=summation)
+
     def process(orders: list[Order]) -> Result:
-        processed: list[ProcessedOrder] = []
+        processed = settle(orders)
+        revenue = summation(p["total"] for p in processed)
+        return {"orders": processed, "revenue": revenue, "count": len(processed)}
 
-        for o in orders:
-            if not o.get("paid"):
-                continue
+    return process
 
-            s = subtotal(o)
-            if not accept(s):
-                continue
 
-            total = apply_tax(apply_discount(s))
-            processed.append({"id": o["id"], "total": total})
+def merge_results(parts: Iterable[Result], summation: Summation = sum) -> Result:
+    """
+    Об'єднати часткові Result (наприклад, по шардах) у порядку parts.
+
+    revenue перераховується по всіх total у вихідному порядку, а не як сума
+    часткових revenue, тож результат побітово збігається з послідовним
+    запуском незалежно від розбиття на шарди (за тієї самої summation).
+    """
+    processed = [p for part in parts for p in part["orders"]]
+    revenue = summation(p["total"] for p in processed)
+    return {"orders": processed, "revenue": revenue, "count": len(processed)}
+
+
+# === Потокова обробка =========================================================
+
+class OrderStream(Iterator[ProcessedOrder]):
+    """
+    Лінивий потік ProcessedOrder з поточними агрегатами revenue і count.
+
+    Замовлення читаються з будь-якого iterable по одному, нічого не
+    накопичується — пам'ять O(1) незалежно від розміру входу. revenue
+    накопичується поточним варіантом стратегії підсумовування (running_sum),
+    тож після вичерпання потоку count і revenue побітово дорівнюють
+    Result["count"] і Result["revenue"] з make_processor за тієї самої
+    summation.
+    """
+
+    __slots__ = ("_orders", "_step", "_revenue", "count")
+
+    def __init__(
+        self, orders: Iterable[Order], step: OrderStep, revenue: RunningSum | None = None
+    ) -> None:
+        self._orders = iter(orders)
+        self._step = step
+        self._revenue = running_sum(sum) if revenue is None else revenue
+        self.count = 0
+
+    @property
+    def revenue(self) -> float:
+        return self._revenue.value
+
+    def __iter__(self) -> OrderStream:
+        return self
+
+    def __next__(self) -> ProcessedOrder:
+        step = self._step
+        for o in self._orders:
+            p = step(o)
+            if p is not None:
+                self._revenue.add(p["total"])
+                self.count += 1
+                return p
+        raise StopIteration
 
-        revenue = sum(p["total"] for p in processed)
-        return {"orders": processed, "revenue": revenue, "count": len(processed)}
+
+def make_stream_processor(
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+    *,
+    summation: Summation = sum,
+) -> Callable[[Iterable[Order]], OrderStream]:
+    """Потоковий аналог make_processor: process(orders) -> OrderStream."""
+    step = compile_policies(accept, apply_discount, apply_tax, summation=summation)
+    running_sum(summation)  # непідтримувана стратегія — помилка одразу, а не на першому потоці
+
+    def process(orders: Iterable[Order]) -> OrderStream:
+        return OrderStream(orders, step, running_sum(summation))
 
     return process
 
@@ -103,9 +531,20 @@ def process_orders_pure(
     tax_rate: float,
 ) -> Result:
     """Готова конфігурація конвеєра під методичку."""
-    processor = make_processor(
-        accept=accept_min_total(min_total),
-        apply_discount=apply_discount_rate(discount),
-        apply_tax=apply_tax_rate(tax_rate),
+    processor = make_processor(*policy_spec(min_total, discount, tax_rate))
+    return processor(orders)
+
+
+def process_orders_stream(
+    orders: Iterable[Order],
+    *,
+    min_total: float,
+    discount: float,
+    tax_rate: float,
+    summation: Summation = sum,
+) -> OrderStream:
+    """Те саме, що process_orders_pure, але ліниво над будь-яким iterable."""
+    processor = make_stream_processor(
+        *policy_spec(min_total, discount, tax_rate), summation=summation
     )
     return processor(orders)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterable
+
+from core import (
+    Order,
+    PolicySpec,
+    ProcessedOrder,
+    Result,
+    compile_policies,
+    make_processor,
+)
+
+
+class RevenueIndex:
+    """
+    Інкрементальний revenue/count поверх make_processor.
+
+    Індекс тримає останню версію кожного замовлення (ключ — id) і його внесок
+    у підсумок. upsert/remove перераховують лише одне замовлення —
+    O(кількість його товарів) замість повного process над усіма.
+
+    Замовлення, передані в upsert, не мають змінюватися після цього
+    (так само, як чисте ядро не змінює свої входи).
+    """
+
+    __slots__ = ("_step", "_process", "_orders", "_contrib", "revenue", "count")
+
+    def __init__(
+        self,
+        accept: Callable[[float], bool],
+        apply_discount: Callable[[float], float],
+        apply_tax: Callable[[float], float],
+        orders: Iterable[Order] = (),
+    ) -> None:
+        self._step = compile_policies(accept, apply_discount, apply_tax)
+        self._process = make_processor(accept, apply_discount, apply_tax)
+        self._orders: dict[int, Order] = {}
+        self._contrib: dict[int, ProcessedOrder] = {}
+        self.revenue: float = 0.0
+        self.count = 0
+        for o in orders:
+            self.upsert(o)
+
+    @classmethod
+    def from_spec(cls, spec: PolicySpec, orders: Iterable[Order] = ()) -> RevenueIndex:
+        return cls(*spec, orders=orders)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._orders
+
+    # ---- оновлення ----
+
+    def upsert(self, order: Order) -> None:
+        """Додати нове або замінити наявне замовлення з тим самим id."""
+        oid = order["id"]
+        self._retract(oid)
+        self._orders[oid] = order
+        p = self._step(order)
+        if p is not None:
+            self._contrib[oid] = p
+            self.revenue += p["total"]
+            self.count += 1
+
+    def remove(self, order_id: int) -> None:
+        """Видалити замовлення; KeyError, якщо такого id немає."""
+        if order_id not in self._orders:
+            raise KeyError(order_id)
+        self._retract(order_id)
+        del self._orders[order_id]
+
+    def _retract(self, order_id: int) -> None:
+        old = self._contrib.pop(order_id, None)
+        if old is None:
+            return
+        self.count -= 1
+        # Порожній підсумок — точний нуль, без накопиченої похибки.
+        self.revenue = self.revenue - old["total"] if self.count else 0.0
+
+    # ---- читання ----
+
+    def result(self) -> Result:
+        """Поточний Result у порядку додавання id до індексу."""
+        contrib = self._contrib
+        processed = [contrib[oid] for oid in self._orders if oid in contrib]
+        return {"orders": processed, "revenue": self.revenue, "count": self.count}
+
+    def recompute(self) -> Result:
+        """Повний перерахунок через make_processor (еталон для перевірки)."""
+        return self._process(list(self._orders.values()))
+
+    def is_consistent(self, rel_tol: float = 1e-9, abs_tol: float = 1e-6) -> bool:
+        """
+        Звірити інкрементальний стан із повним перерахунком.
+
+        Замовлення і count мають збігатися точно; revenue — з допуском, бо
+        послідовні додавання/віднімання накопичують похибку округлення.
+        """
+        full = self.recompute()
+        mine = self.result()
+        return (
+            mine["orders"] == full["orders"]
+            and mine["count"] == full["count"]
+            and math.isclose(mine["revenue"], full["revenue"], rel_tol=rel_tol, abs_tol=abs_tol)
+        )
+
+    def rebuild(self) -> None:
+        """Скинути накопичену похибку: revenue := точний повний підсумок."""
+        self.revenue = self.recompute()["revenue"]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pickle
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from core import (
+    Order,
+    PolicySpec,
+    Result,
+    Summation,
+    make_processor,
+    merge_results,
+    policy_spec,
+)
+
+# Скільки шардів на воркер за замовчуванням: трохи більше за 1, щоб
+# повільний шард не лишав інші процеси без роботи.
+_CHUNKS_PER_WORKER = 4
+
+
+def _process_chunk(spec: PolicySpec, summation: Summation, chunk: list[Order]) -> Result:
+    """Воркер: звичайний make_processor над одним шардом."""
+    return make_processor(*spec, summation=summation)(chunk)
+
+
+def split(orders: list[Order], chunk_size: int) -> list[list[Order]]:
+    """Розбити замовлення на послідовні шарди не довші за chunk_size."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    return [orders[i : i + chunk_size] for i in range(0, len(orders), chunk_size)]
+
+
+def make_parallel_processor(
+    spec: PolicySpec,
+    *,
+    workers: int,
+    chunk_size: int | None = None,
+    summation: Summation = sum,
+) -> Callable[[list[Order]], Result]:
+    """
+    Повертає process(orders) -> Result, що розподіляє шарди по процесах.
+
+    Шарди обробляються в ProcessPoolExecutor і зливаються через merge_results
+    у вихідному порядку, тож результат (включно з revenue) побітово збігається
+    з make_processor(*spec, summation=summation). spec і summation мають бути
+    picklable — тобто складатися з вбудованих політик (accept_min_total /
+    apply_discount_rate / apply_tax_rate), а не з лямбд чи замикань.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    try:
+        pickle.dumps((spec, summation))
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise TypeError(
+            "policies must be picklable to run in worker processes; "
+            "use accept_min_total/apply_discount_rate/apply_tax_rate"
+        ) from e
+
+    serial = make_processor(*spec, summation=summation)
+    work = partial(_process_chunk, spec, summation)
+
+    def process(orders: list[Order]) -> Result:
+        size = chunk_size
+        if size is None:
+            size = max(1, -(-len(orders) // (workers * _CHUNKS_PER_WORKER)))
+        if workers == 1 or len(orders) <= size:
+            return serial(orders)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(work, split(orders, size)))
+        return merge_results(parts, summation)
+
+    return process
+
+
+def process_orders_parallel(
+    orders: list[Order],
+    *,
+    min_total: float,
+    discount: float,
+    tax_rate: float,
+    workers: int,
+    chunk_size: int | None = None,
+) -> Result:
+    """Паралельний варіант process_orders_pure."""
+    processor = make_parallel_processor(
+        policy_spec(min_total, discount, tax_rate),
+        workers=workers,
+        chunk_size=chunk_size,
+    )
+    return processor(orders)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Sequence
+
+import pytest
+
+import core
+
+
+def make_random_order(
+    rnd: random.Random,
+    oid: int,
+    *,
+    paid: float = 0.7,
+    price: tuple[float, float] = (1.0, 200.0),
+    qty: tuple[int, int] = (1, 3),
+    item_counts: Sequence[int] = range(5),
+) -> core.Order:
+    """Випадкове замовлення: оплачене з імовірністю paid, ціни й кількості — у межах."""
+    return {
+        "id": oid,
+        "paid": rnd.random() < paid,
+        "items": [
+            {"price": rnd.uniform(*price), "qty": rnd.randint(*qty)}
+            for _ in range(rnd.choice(item_counts))
+        ],
+    }
+
+
+def make_random_orders(
+    n: int,
+    seed: int,
+    *,
+    paid: float = 0.7,
+    price: tuple[float, float] = (1.0, 200.0),
+    qty: tuple[int, int] = (1, 3),
+    item_counts: Sequence[int] = range(5),
+) -> list[core.Order]:
+    """n випадкових замовлень з id 0..n-1, відтворюваних за seed."""
+    rnd = random.Random(seed)
+    return [
+        make_random_order(rnd, i, paid=paid, price=price, qty=qty, item_counts=item_counts)
+        for i in range(n)
+    ]
+
+
+@pytest.fixture()
+def random_order() -> Callable[..., core.Order]:
+    """make_random_order для тестів, що генерують замовлення по одному."""
+    return make_random_order
+
+
+@pytest.fixture()
+def random_orders() -> Callable[..., list[core.Order]]:
+    """make_random_orders для тестів на випадкових пакетах замовлень."""
+    return make_random_orders
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import pytest
+
+import columnar
+import core
+
+
+@pytest.fixture()
+def orders(random_orders: Callable[..., list[core.Order]]) -> list[core.Order]:
+    return random_orders(
+        500, 42, paid=0.8, price=(-50.0, 500.0), qty=(0, 5), item_counts=(0, 1, 2, 3, 12, 40)
+    )
+
+
+def test_builtin_policies_are_callable() -> None:
+    assert core.accept_min_total(100)(100.0)
+    assert not core.accept_min_total(100)(99.99)
+    assert core.apply_discount_rate(0.1)(120.0) == 120.0 * (1 - 0.1)
+    assert core.apply_tax_rate(0.2)(108.0) == 108.0 * (1 + 0.2)
+
+
+@pytest.mark.parametrize("min_total,discount,tax_rate", [(100, 0.1, 0.2), (0, 0.0, 0.0)])
+def test_columnar_matches_scalar(
+    orders: list[core.Order], min_total: float, discount: float, tax_rate: float
+) -> None:
+    pytest.importorskip("numpy")
+    policies = (
+        core.accept_min_total(min_total),
+        core.apply_discount_rate(discount),
+        core.apply_tax_rate(tax_rate),
+    )
+    expected = core.make_processor(*policies)(orders)
+    got = columnar.make_columnar_processor(*policies)(orders)
+    assert got == expected  # побітово, не approx
+
+
+def test_segment_sums_empty_segments() -> None:
+    np = pytest.importorskip("numpy")
+    values = np.array([1.0, 2.0, 3.0])
+    offsets = np.array([0, 0, 2, 2, 3])
+    assert columnar.segment_sums(values, offsets).tolist() == [0.0, 3.0, 0.0, 3.0]
+
+
+def test_custom_closures_fall_back_to_scalar(orders: list[core.Order]) -> None:
+    accept = lambda s: s > 50
+    discount = core.apply_discount_rate(0.1)
+    tax = lambda a: a + 1.0
+
+    processor = columnar.make_columnar_processor(accept, discount, tax)
+    assert processor(orders) == core.make_processor(accept, discount, tax)(orders)
+
+
+@pytest.mark.parametrize("builtin", [True, False])
+def test_prebuilt_columns_match_scalar(orders: list[core.Order], builtin: bool) -> None:
+    pytest.importorskip("numpy")
+    policies = (
+        (core.accept_min_total(100), core.apply_discount_rate(0.1), core.apply_tax_rate(0.2))
+        if builtin
+        else (lambda s: s > 50, lambda s: s * 0.9, lambda a: a + 1.0)
+    )
+    expected = core.make_processor(*policies)(orders)
+    cols = columnar.flatten_orders(orders)
+    process = columnar.make_columns_processor(*policies)
+    assert process(cols) == expected
+    assert process(cols) == expected  # колонки не змінюються між запусками
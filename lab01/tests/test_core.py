@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import math
+import random
+from collections.abc import Callable, Iterator
 from copy import deepcopy
+from itertools import count, islice
 
 import pytest
 
@@ -53,3 +57,106 @@ def test_callable_policies(sample_orders: list[core.Order]) -> None:
     assert isinstance(result["orders"], list)
     assert result["orders"][0]["id"] == 1
     assert pytest.approx(result["orders"][0]["total"], rel=1e-9) == 129.6
+
+
+@pytest.mark.parametrize(
+    "accept",
+    [core.accept_min_total(100), lambda s: s >= 100],
+)
+@pytest.mark.parametrize(
+    "apply_discount,apply_tax",
+    [
+        (core.apply_discount_rate(0.1), core.apply_tax_rate(0.2)),
+        (lambda s: s * (1 - 0.1), lambda a: a * (1 + 0.2)),
+        (core.apply_discount_rate(0.1), lambda a: a * (1 + 0.2)),
+    ],
+)
+def test_compiled_policies_match_closure_chain(
+    sample_orders: list[core.Order],
+    accept: Callable[[float], bool],
+    apply_discount: Callable[[float], float],
+    apply_tax: Callable[[float], float],
+) -> None:
+    step = core.compile_policies(accept, apply_discount, apply_tax)
+    for o in sample_orders:
+        s = core.subtotal(o)
+        expected = (
+            {"id": o["id"], "total": apply_tax(apply_discount(s))}
+            if o["paid"] and accept(s)
+            else None
+        )
+        assert step(o) == expected  # точна рівність: множення в тому ж порядку
+
+
+@pytest.mark.parametrize("name", sorted(core.SUMMATIONS))
+def test_stream_matches_batch(name: str, random_orders: Callable[..., list[core.Order]]) -> None:
+    summation = core.SUMMATIONS[name]
+    orders = random_orders(3000, 11, price=(0.01, 1e6), item_counts=range(1, 8))
+    spec = core.policy_spec(0, 0.1, 0.2)
+    batch = core.make_processor(*spec, summation=summation)(orders)
+    stream = core.make_stream_processor(*spec, summation=summation)(iter(orders))
+
+    assert list(stream) == batch["orders"]
+    assert stream.count == batch["count"]
+    assert stream.revenue == batch["revenue"]  # побітово, для кожної стратегії
+
+
+def test_stream_rejects_unknown_summation() -> None:
+    with pytest.raises(ValueError):
+        core.make_stream_processor(*core.policy_spec(0, 0, 0), summation=lambda xs: 0.0)
+
+
+def test_running_sums_handle_special_values() -> None:
+    for xs in ([1e308, 1e308, -1e308], [math.inf, 1.0], [math.inf, -math.inf], [0.1] * 10):
+        for summation in (sum, core.neumaier_sum, math.fsum):
+            acc = core.running_sum(summation)
+            for x in xs:
+                acc.add(x)
+            try:
+                expected = summation(xs)
+            except (ValueError, OverflowError):
+                continue  # fsum відмовляється від inf - inf та переповнення
+            assert acc.value == expected or (math.isnan(acc.value) and math.isnan(expected))
+
+
+def test_stream_is_lazy() -> None:
+    def endless() -> Iterator[core.Order]:
+        for i in count():
+            yield {"id": i, "paid": i % 2 == 0, "items": [{"price": 10.0, "qty": 1}]}
+
+    stream = core.process_orders_stream(endless(), min_total=0, discount=0.0, tax_rate=0.0)
+    first = list(islice(stream, 3))
+    assert [p["id"] for p in first] == [0, 2, 4]
+    assert stream.count == 3
+    assert stream.revenue == 30.0
+
+
+def test_summation_strategies_accuracy() -> None:
+    xs = [0.1] * 10 + [1e16, 1.0, -1e16]
+    assert core.SUMMATIONS["fsum"](xs) == 2.0
+    assert core.neumaier_sum(xs) == 2.0
+    assert core.cents_sum([0.1, 0.2, 0.3]) == 0.6
+    assert core.cents_sum([]) == 0
+
+
+@pytest.mark.parametrize("name", ["fsum", "cents"])
+def test_exact_summation_ignores_order_and_chunking(name: str) -> None:
+    rnd = random.Random(11)
+    orders: list[core.Order] = [
+        {
+            "id": i,
+            "paid": True,
+            "items": [{"price": rnd.uniform(0.01, 1e6), "qty": rnd.randint(1, 9)}],
+        }
+        for i in range(300)
+    ]
+    summation = core.SUMMATIONS[name]
+    process = core.make_processor(*core.policy_spec(0, 0.07, 0.2), summation=summation)
+    serial = process(orders)
+
+    shuffled = orders[:]
+    rnd.shuffle(shuffled)
+    assert process(shuffled)["revenue"] == serial["revenue"]
+
+    parts = [process(orders[i : i + 17]) for i in range(0, len(orders), 17)]
+    assert core.merge_results(parts, summation)["revenue"] == serial["revenue"]
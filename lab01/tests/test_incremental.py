@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+
+import pytest
+
+import core
+from incremental import RevenueIndex
+
+
+def test_upsert_and_remove() -> None:
+    index = RevenueIndex.from_spec(core.policy_spec(100, 0.1, 0.2))
+    index.upsert({"id": 1, "paid": True, "items": [{"price": 120.0, "qty": 1}]})
+    index.upsert({"id": 2, "paid": False, "items": [{"price": 500.0, "qty": 1}]})
+    assert index.count == 1
+    assert pytest.approx(index.revenue) == 129.6
+
+    index.upsert({"id": 2, "paid": True, "items": [{"price": 500.0, "qty": 1}]})  # оплачено
+    assert index.count == 2
+    assert [p["id"] for p in index.result()["orders"]] == [1, 2]
+
+    index.remove(1)
+    index.remove(2)
+    assert (index.count, index.revenue, len(index)) == (0, 0.0, 0)
+    with pytest.raises(KeyError):
+        index.remove(1)
+
+
+def test_random_events_match_full_recompute(random_order: Callable[..., core.Order]) -> None:
+    rnd = random.Random(3)
+    index = RevenueIndex(
+        core.accept_min_total(50), core.apply_discount_rate(0.05), lambda a: a * 1.07
+    )
+    for _ in range(2000):
+        oid = rnd.randrange(100)
+        if oid in index and rnd.random() < 0.3:
+            index.remove(oid)
+        else:
+            index.upsert(random_order(rnd, oid))
+    assert index.is_consistent()
+
+    index.rebuild()
+    assert index.result() == index.recompute()
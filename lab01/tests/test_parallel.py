@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import pytest
+
+import core
+import parallel
+
+
+@pytest.fixture()
+def many_orders(random_orders: Callable[..., list[core.Order]]) -> list[core.Order]:
+    return random_orders(1000, 7, price=(0.01, 300.0), qty=(1, 4), item_counts=range(1, 6))
+
+
+def test_split_keeps_order() -> None:
+    orders: list[core.Order] = [{"id": i, "paid": True, "items": []} for i in range(5)]
+    chunks = parallel.split(orders, 2)
+    assert [[o["id"] for o in c] for c in chunks] == [[0, 1], [2, 3], [4]]
+
+
+def test_merge_results_is_chunking_independent(many_orders: list[core.Order]) -> None:
+    process = core.make_processor(*core.policy_spec(100, 0.1, 0.2))
+    serial = process(many_orders)
+    for size in (1, 7, 333):
+        parts = [process(c) for c in parallel.split(many_orders, size)]
+        assert core.merge_results(parts) == serial  # побітово, включно з revenue
+
+
+def test_parallel_matches_serial(many_orders: list[core.Order]) -> None:
+    args = dict(min_total=100, discount=0.1, tax_rate=0.2)
+    serial = core.process_orders_pure(many_orders, **args)
+    got = parallel.process_orders_parallel(many_orders, workers=2, chunk_size=128, **args)
+    assert got == serial
+
+
+def test_unpicklable_policies_rejected() -> None:
+    spec = core.PolicySpec(lambda s: s > 0, core.apply_discount_rate(0.1), lambda a: a)
+    with pytest.raises(TypeError):
+        parallel.make_parallel_processor(spec, workers=2)
+
+
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_non_positive_chunk_size_rejected(chunk_size: int) -> None:
+    with pytest.raises(ValueError):
+        parallel.make_parallel_processor(
+            core.policy_spec(0, 0, 0), workers=2, chunk_size=chunk_size
+        )
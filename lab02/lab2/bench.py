@@ -0,0 +1,156 @@
+"""Microbenchmarks for the record pipeline.
+
+Run: ``python -m lab2.bench [--records N] [--repeat R]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+from collections import deque
+from functools import reduce
+from typing import Any, Callable, Iterable, Iterator, List
+
+from .lab2 import (
+    Record,
+    boost_city,
+    compose,
+    normalize_names,
+    only_adults,
+    plan_pipeline,
+    sort_by_total_desc,
+    take,
+    top_by_total_desc,
+    with_total,
+)
+
+
+def make_records(n: int, seed: int = 0) -> List[Record]:
+    rnd = random.Random(seed)
+    cities = ["Delhi", "Kyiv", "Prague", "Oslo"]
+    return [
+        {
+            "id": i,
+            "name": f"  user {i} ",
+            "age": rnd.randint(10, 70),
+            "city": rnd.choice(cities),
+            "purchases": [round(rnd.uniform(0, 100), 2) for _ in range(rnd.randint(0, 5))],
+        }
+        for i in range(n)
+    ]
+
+
+def closure_stages(city: str, factor: float) -> List[Callable[[Iterable[Record]], Any]]:
+    """The original closure-based generator stages, one dict copy per stage."""
+
+    def normalize(recs: Iterable[Record]) -> Iterator[Record]:
+        for r in recs:
+            yield {**r, "name": str(r.get("name", "")).strip().title()}
+
+    def adults(recs: Iterable[Record]) -> Iterator[Record]:
+        for r in recs:
+            if int(r.get("age", 0)) >= 18:
+                yield r
+
+    def total(recs: Iterable[Record]) -> Iterator[Record]:
+        for r in recs:
+            yield {**r, "total": float(sum(r.get("purchases", []) or []))}
+
+    def boost(recs: Iterable[Record]) -> Iterator[Record]:
+        for r in recs:
+            base = float(r.get("total", 0.0))
+            boosted = base * factor if r.get("city") == city else base
+            yield {**r, "total": round(boosted, 10)}
+
+    return [normalize, adults, total, boost]
+
+
+def report(label: str, fn: Callable[[], object], repeat: int, n: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"  {label:<34} {best * 1e3:9.2f} ms  {best / n * 1e9:8.1f} ns/record")
+    return best
+
+
+def bench_fusion(data: List[Record], repeat: int) -> None:
+    print(f"record stages ({len(data)} records)")
+    closures = compose(*reversed(closure_stages("Delhi", 1.1)))
+    stages = (normalize_names(), only_adults(18), with_total(), boost_city("Delhi", 1.1))
+    unfused = compose(*reversed(stages))
+    fused = plan_pipeline(*stages)
+    assert list(fused(data)) == list(closures(data))
+
+    def drain(p: Callable[[Any], Any]) -> Callable[[], object]:
+        return lambda: deque(p(data), maxlen=0)
+
+    base = report("closure generators (baseline)", drain(closures), repeat, len(data))
+    report("stage objects, unfused", drain(unfused), repeat, len(data))
+    best = report("plan_pipeline, fused", drain(fused), repeat, len(data))
+    print(f"  speedup vs baseline: x{base / best:.2f}")
+
+
+def bench_top_n(data: List[Record], repeat: int, n: int = 3) -> None:
+    print(f"top-{n} ({len(data)} records)")
+    totals = list(with_total()(data))
+    sort_take = compose(take(n), sort_by_total_desc())
+    top = top_by_total_desc(n)
+    assert top(totals) == sort_take(totals)
+
+    base = report("sorted + take (baseline)", lambda: sort_take(totals), repeat, len(data))
+    best = report("heap top-k", lambda: top(totals), repeat, len(data))
+    print(f"  speedup vs baseline: x{base / best:.2f}")
+
+
+def loop_compose(*funcs: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """The original compose: ``reversed(funcs)`` and a loop on every call."""
+
+    def _c(x: Any) -> Any:
+        for f in reversed(funcs):
+            x = f(x)
+        return x
+
+    return _c
+
+
+def reduce_compose(*funcs: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """``functools.reduce`` with a lambda per call, as in lab07/lab10."""
+    return lambda x: reduce(lambda acc, f: f(acc), reversed(funcs), x)
+
+
+def bench_compose(calls: int, repeat: int) -> None:
+    print(f"compose call overhead ({calls} calls)")
+
+    def inc(x: int) -> int:
+        return x + 1
+
+    def run(c: Callable[[Any], Any]) -> Callable[[], object]:
+        return lambda: deque(map(c, range(calls)), maxlen=0)
+
+    for n in (1, 2, 3, 5, 10):
+        funcs = [inc] * n
+        variants = {
+            "reduce + lambda (lab07/lab10)": reduce_compose(*funcs),
+            "loop over reversed (baseline)": loop_compose(*funcs),
+            "compose": compose(*funcs),
+            "compose(codegen=True)": compose(*funcs, codegen=True),
+        }
+        print(f" {n} function(s)")
+        for label, c in variants.items():
+            assert c(0) == n
+            report(label, run(c), repeat, calls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lab 2 pipeline microbenchmarks")
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_records(args.records)
+    bench_fusion(data, args.repeat)
+    bench_top_n(data, args.repeat)
+    bench_compose(args.records, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
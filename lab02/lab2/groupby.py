@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import math
+import pickle
+import tempfile
+from dataclasses import dataclass
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .stats import StatsAccumulator
+
+Row = Mapping[str, Any]
+KeyFn = Callable[[Row], Hashable]
+
+
+# ---- Aggregates ----
+#
+# An aggregate describes one output column: ``init`` creates the per-group state,
+# ``step`` folds one record into it, ``merge`` combines two partial states (used
+# when groups are spilled to disk) and ``result`` turns the state into a value.
+
+
+@dataclass(frozen=True)
+class Count:
+    def init(self) -> int:
+        return 0
+
+    def step(self, state: int, r: Row) -> int:
+        return state + 1
+
+    def merge(self, a: int, b: int) -> int:
+        return a + b
+
+    def result(self, state: int) -> int:
+        return state
+
+
+@dataclass(frozen=True)
+class SumOf:
+    field: str
+
+    def init(self) -> float:
+        return 0.0
+
+    def step(self, state: float, r: Row) -> float:
+        return state + float(r.get(self.field, 0.0))
+
+    def merge(self, a: float, b: float) -> float:
+        return a + b
+
+    def result(self, state: float) -> float:
+        return state
+
+
+@dataclass(frozen=True)
+class MinOf:
+    field: str
+
+    def init(self) -> float:
+        return math.inf
+
+    def step(self, state: float, r: Row) -> float:
+        x = float(r.get(self.field, 0.0))
+        return x if x < state else state
+
+    def merge(self, a: float, b: float) -> float:
+        return min(a, b)
+
+    def result(self, state: float) -> float:
+        return state
+
+
+@dataclass(frozen=True)
+class MaxOf:
+    field: str
+
+    def init(self) -> float:
+        return -math.inf
+
+    def step(self, state: float, r: Row) -> float:
+        x = float(r.get(self.field, 0.0))
+        return x if x > state else state
+
+    def merge(self, a: float, b: float) -> float:
+        return max(a, b)
+
+    def result(self, state: float) -> float:
+        return state
+
+
+@dataclass(frozen=True)
+class MeanOf:
+    field: str
+
+    def init(self) -> List[float]:
+        return [0.0, 0.0]
+
+    def step(self, state: List[float], r: Row) -> List[float]:
+        state[0] += float(r.get(self.field, 0.0))
+        state[1] += 1.0
+        return state
+
+    def merge(self, a: List[float], b: List[float]) -> List[float]:
+        return [a[0] + b[0], a[1] + b[1]]
+
+    def result(self, state: List[float]) -> float:
+        return state[0] / state[1] if state[1] else 0.0
+
+
+@dataclass(frozen=True)
+class StatsOf:
+    """Full :class:`StatsAccumulator` summary (count, mean, variance, quantiles...)."""
+
+    field: str
+
+    def init(self) -> StatsAccumulator:
+        return StatsAccumulator()
+
+    def step(self, state: StatsAccumulator, r: Row) -> StatsAccumulator:
+        state.add(float(r.get(self.field, 0.0)))
+        return state
+
+    def merge(self, a: StatsAccumulator, b: StatsAccumulator) -> StatsAccumulator:
+        return a.merge(b)
+
+    def result(self, state: StatsAccumulator) -> Dict[str, float]:
+        return state.summary()
+
+
+Aggregate = Union[Count, SumOf, MinOf, MaxOf, MeanOf, StatsOf]
+
+
+def count() -> Count:
+    return Count()
+
+
+def sum_of(field: str) -> SumOf:
+    return SumOf(field)
+
+
+def min_of(field: str) -> MinOf:
+    return MinOf(field)
+
+
+def max_of(field: str) -> MaxOf:
+    return MaxOf(field)
+
+
+def mean_of(field: str) -> MeanOf:
+    return MeanOf(field)
+
+
+def stats_of(field: str) -> StatsOf:
+    return StatsOf(field)
+
+
+# ---- Group-by stage ----
+
+# How many times a partition that is still over ``max_groups`` is split again
+# with a fresh hash salt. Only keys with equal ``hash`` never separate; past
+# this depth such a partition is merged in memory as a whole.
+_MAX_SPLITS = 16
+
+_MASK64 = (1 << 64) - 1
+
+
+def _partition(k: Hashable, salt: int, n: int) -> int:
+    """Spill file for key ``k`` out of ``n``; each ``salt`` gives an independent split.
+
+    Small ints hash to themselves, so ``hash(k) % n`` would repeat the same split
+    at every level; the salt is mixed in with the splitmix64 finalizer instead.
+    """
+    h = (hash(k) + salt * 0x9E3779B97F4A7C15) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return (h ^ (h >> 31)) % n
+
+
+@dataclass(frozen=True)
+class GroupBy:
+    """Hash aggregation: one pass over ``recs``, one output row per distinct key.
+
+    Each output row holds the key under ``key_name`` and one column per entry of
+    ``aggs``. Rows come out in first-seen key order. If ``max_groups`` is set and
+    the in-memory table grows beyond it, partial states are hash-partitioned into
+    temporary files and merged partition by partition at the end. A partition
+    that still holds more than ``max_groups`` keys is split again, so the merge
+    phase is bounded by ``max_groups`` as well (unless ``partitions`` is 1).
+
+    Spilling changes the row order, which then follows the partitions. ``count``,
+    ``min_of`` and ``max_of`` come out exactly as without spilling; ``sum_of``,
+    ``mean_of`` and ``stats_of`` add up partial states with ``merge``, so their
+    floats may differ from the in-memory result by rounding.
+    """
+
+    key: KeyFn
+    key_name: str
+    aggs: Tuple[Tuple[str, Aggregate], ...]
+    max_groups: Optional[int] = None
+    partitions: int = 16
+    spill_dir: Optional[str] = None
+
+    def __call__(self, recs: Iterable[Row]) -> Iterator[Dict[str, Any]]:
+        key = self.key
+        aggs = [a for _, a in self.aggs]
+        inits = [a.init for a in aggs]
+        steps = list(enumerate(a.step for a in aggs))
+        limit = self.max_groups
+        table: Dict[Hashable, List[Any]] = {}
+        spill: Optional[List[IO[bytes]]] = None
+
+        try:
+            for r in recs:
+                k = key(r)
+                states = table.get(k)
+                if states is None:
+                    if limit is not None and len(table) >= limit:
+                        spill = self._spill(table, spill)
+                    states = table[k] = [init() for init in inits]
+                for i, step in steps:
+                    states[i] = step(states[i], r)
+
+            if spill is None:
+                yield from self._rows(table)
+                return
+            spill = self._spill(table, spill)
+            for f in spill:
+                yield from self._merge(f, 1)
+        finally:
+            for f in spill or ():
+                f.close()
+
+    def _spill(
+        self,
+        table: Dict[Hashable, List[Any]],
+        files: Optional[List[IO[bytes]]],
+        salt: int = 0,
+    ) -> List[IO[bytes]]:
+        n = self.partitions
+        if files is None:
+            files = [tempfile.TemporaryFile(dir=self.spill_dir) for _ in range(n)]
+        for k, states in table.items():
+            pickle.dump((k, states), files[_partition(k, salt, n)], pickle.HIGHEST_PROTOCOL)
+        table.clear()
+        return files
+
+    def _merge(self, f: IO[bytes], depth: int) -> Iterator[Dict[str, Any]]:
+        """Merge the partial states spilled to ``f`` and yield one row per key.
+
+        Once more than ``max_groups`` keys are in memory the table is spilled
+        again, salted with ``depth``, and every sub-partition is merged in turn.
+        """
+        merges = [a.merge for _, a in self.aggs]
+        limit = self.max_groups if self.partitions > 1 and depth <= _MAX_SPLITS else None
+        table: Dict[Hashable, List[Any]] = {}
+        sub: Optional[List[IO[bytes]]] = None
+        try:
+            with f:
+                f.seek(0)
+                while True:
+                    try:
+                        k, states = pickle.load(f)
+                    except EOFError:
+                        break
+                    prev = table.get(k)
+                    if prev is None:
+                        if limit is not None and len(table) >= limit:
+                            sub = self._spill(table, sub, depth)
+                        table[k] = states
+                    else:
+                        table[k] = [m(a, b) for m, a, b in zip(merges, prev, states)]
+
+            if sub is None:
+                yield from self._rows(table)
+                return
+            sub = self._spill(table, sub, depth)
+            for g in sub:
+                yield from self._merge(g, depth + 1)
+        finally:
+            for g in sub or ():
+                g.close()
+
+    def _rows(self, table: Dict[Hashable, List[Any]]) -> Iterator[Dict[str, Any]]:
+        names = [name for name, _ in self.aggs]
+        results = [a.result for _, a in self.aggs]
+        for k, states in table.items():
+            row: Dict[str, Any] = {self.key_name: k}
+            for name, result, state in zip(names, results, states):
+                row[name] = result(state)
+            yield row
+
+
+def group_by(
+    key: Union[str, KeyFn],
+    aggs: Mapping[str, Aggregate],
+    *,
+    max_groups: Optional[int] = None,
+    partitions: int = 16,
+    spill_dir: Optional[str] = None,
+) -> GroupBy:
+    """Build a group-by stage, e.g. ``group_by("city", {"n": count(), "sum": sum_of("total")})``.
+
+    ``key`` is a field name or a function of the record (then the output column
+    is called ``key``). Pass ``max_groups`` to bound memory for high-cardinality
+    keys; overflowing groups are spilled to temporary files under ``spill_dir``.
+    """
+    if not aggs:
+        raise ValueError("group_by needs at least one aggregate")
+    if max_groups is not None and max_groups < 1:
+        raise ValueError("max_groups must be positive")
+    if partitions < 1:
+        raise ValueError("partitions must be positive")
+    if isinstance(key, str):
+        field = key
+
+        def key_fn(r: Row) -> Hashable:
+            return r.get(field)
+
+        return GroupBy(key_fn, field, tuple(aggs.items()), max_groups, partitions, spill_dir)
+    return GroupBy(key, "key", tuple(aggs.items()), max_groups, partitions, spill_dir)
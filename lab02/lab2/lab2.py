@@ -1,8 +1,32 @@
 from __future__ import annotations
 
+import heapq
+import math
+import operator
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from functools import reduce
 from itertools import islice
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Protocol, TypedDict
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
+
+from .stats import StatsAccumulator
 
 # ---- Types ----
 
@@ -26,11 +50,77 @@ class _UnaryProtocol(Protocol):
 # ---- Functional helpers ----
 
 
-def compose(*funcs: Unary) -> Unary:
-    """Right-to-left function composition: compose(f, g)(x) == f(g(x))."""
+_CHAIN_ATTR = "_compose_chain"
 
+
+def _chain_of(funcs: Sequence[Unary]) -> Tuple[Unary, ...]:
+    """Functions of a right-to-left composition in call order, nested compositions inlined."""
+    chain: List[Unary] = []
+    for f in reversed(funcs):
+        inner = getattr(f, _CHAIN_ATTR, None)
+        if inner is not None:
+            chain.extend(inner)
+        else:
+            chain.append(f)
+    return tuple(chain)
+
+
+def _identity(x: Any) -> Any:
+    return x
+
+
+def _codegen(chain: Tuple[Unary, ...]) -> Unary:
+    """Emit ``def _c(x): x = f0(x); ...; return x`` with the steps bound as closure cells."""
+    names = [f"f{i}" for i in range(len(chain))]
+    body = "".join(f"        x = {n}(x)\n" for n in names)
+    src = f"def _make({', '.join(names)}):\n    def _c(x):\n{body}        return x\n    return _c\n"
+    ns: Dict[str, Any] = {}
+    exec(compile(src, "<compose>", "exec"), ns)
+    return cast(Unary, ns["_make"](*chain))
+
+
+def compose(*funcs: Unary, codegen: bool = False) -> Unary:
+    """Right-to-left function composition: compose(f, g)(x) == f(g(x)).
+
+    The call chain is fixed when the composition is built: nested compositions
+    are flattened into it and chains of up to three steps get a dedicated
+    closure without a loop. ``codegen=True`` compiles longer chains into one
+    straight-line function.
+    """
+    chain = _chain_of(funcs)
+    if not chain:
+        return _identity
+    if len(chain) == 1:
+        return chain[0]
+    if len(chain) == 2:
+        c = _compose2(*chain)
+    elif len(chain) == 3:
+        c = _compose3(*chain)
+    elif codegen:
+        c = _codegen(chain)
+    else:
+        c = _compose_loop(chain)
+    setattr(c, _CHAIN_ATTR, chain)
+    return c
+
+
+def _compose2(f0: Unary, f1: Unary) -> Unary:
+    def _c(x: Any) -> Any:
+        return f1(f0(x))
+
+    return _c
+
+
+def _compose3(f0: Unary, f1: Unary, f2: Unary) -> Unary:
+    def _c(x: Any) -> Any:
+        return f2(f1(f0(x)))
+
+    return _c
+
+
+def _compose_loop(chain: Tuple[Unary, ...]) -> Unary:
     def _c(x: Any) -> Any:
-        for f in reversed(funcs):
+        for f in chain:
             x = f(x)
         return x
 
@@ -54,74 +144,338 @@ def juxt(*funcs: Unary) -> Callable[[Any], List[Any]]:
 
 
 # ---- Pure transformations for the pipeline ----
+#
+# Record-wise stages are small frozen objects rather than closures: they still
+# behave as ``Iterable[Record] -> Iterator[Record]`` functions, but also expose
+# a per-record step plus the fields they read/write, so ``plan_pipeline`` can
+# fuse a run of them into a single pass.
+
+
+class RecordMap(ABC):
+    """Record-wise stage that derives a new record by updating some fields.
+
+    ``reads``/``writes`` name the fields the stage touches; ``None`` (the
+    default) means "any field", so an undeclared stage is never reordered.
+    """
+
+    reads: ClassVar[Optional[FrozenSet[str]]] = None
+    writes: ClassVar[Optional[FrozenSet[str]]] = None
 
+    @abstractmethod
+    def update(self, r: Dict[str, Any]) -> None:
+        """Apply the stage to ``r`` in place (``r`` is already a private copy)."""
 
-def normalize_names() -> Callable[[Iterable[Record]], Iterator[Record]]:
-    def _f(recs: Iterable[Record]) -> Iterator[Record]:
+    def __call__(self, recs: Iterable[Record]) -> Iterator[Record]:
+        update = self.update
         for r in recs:
-            yield {**r, "name": str(r.get("name", "")).strip().title()}
+            out: Dict[str, Any] = dict(r)
+            update(out)
+            yield cast(Record, out)
 
-    return _f
 
+class RecordFilter(ABC):
+    """Record-wise stage that keeps or drops records unchanged.
 
-def only_adults(min_age: int = 18) -> Callable[[Iterable[Record]], Iterator[Record]]:
-    def _f(recs: Iterable[Record]) -> Iterator[Record]:
+    ``reads`` names the fields ``keep`` looks at; ``None`` means "any field".
+    """
+
+    reads: ClassVar[Optional[FrozenSet[str]]] = None
+
+    @abstractmethod
+    def keep(self, r: Mapping[str, Any]) -> bool:
+        """Whether to pass ``r`` on."""
+
+    def __call__(self, recs: Iterable[Record]) -> Iterator[Record]:
+        keep = self.keep
         for r in recs:
-            if int(r.get("age", 0)) >= min_age:
+            if keep(r):
                 yield r
 
-    return _f
 
+@dataclass(frozen=True)
+class NormalizeNames(RecordMap):
+    reads: ClassVar[FrozenSet[str]] = frozenset({"name"})
+    writes: ClassVar[FrozenSet[str]] = frozenset({"name"})
 
-def with_total() -> Callable[[Iterable[Record]], Iterator[Record]]:
-    def _f(recs: Iterable[Record]) -> Iterator[Record]:
-        for r in recs:
-            purchases = r.get("purchases", []) or []
-            yield {**r, "total": float(sum(purchases))}
+    def update(self, r: Dict[str, Any]) -> None:
+        r["name"] = str(r.get("name", "")).strip().title()
 
-    return _f
 
+@dataclass(frozen=True)
+class OnlyAdults(RecordFilter):
+    min_age: int = 18
+    reads: ClassVar[FrozenSet[str]] = frozenset({"age"})
+
+    def keep(self, r: Mapping[str, Any]) -> bool:
+        return int(r.get("age", 0)) >= self.min_age
+
+
+@dataclass(frozen=True)
+class WithTotal(RecordMap):
+    reads: ClassVar[FrozenSet[str]] = frozenset({"purchases"})
+    writes: ClassVar[FrozenSet[str]] = frozenset({"total"})
+
+    def update(self, r: Dict[str, Any]) -> None:
+        purchases = r.get("purchases", []) or []
+        r["total"] = float(sum(purchases))
+
+
+@dataclass(frozen=True)
+class BoostCity(RecordMap):
+    city: str
+    factor: float
+    reads: ClassVar[FrozenSet[str]] = frozenset({"city", "total"})
+    writes: ClassVar[FrozenSet[str]] = frozenset({"total"})
+
+    def update(self, r: Dict[str, Any]) -> None:
+        base = float(r.get("total", 0.0))
+        boosted = base * self.factor if r.get("city") == self.city else base
+        r["total"] = round(boosted, 10)  # stabilize floats
+
+
+def normalize_names() -> NormalizeNames:
+    return NormalizeNames()
+
+
+def only_adults(min_age: int = 18) -> OnlyAdults:
+    return OnlyAdults(min_age)
+
+
+def with_total() -> WithTotal:
+    return WithTotal()
 
-def boost_city(city: str, factor: float) -> Callable[[Iterable[Record]], Iterator[Record]]:
-    def _f(recs: Iterable[Record]) -> Iterator[Record]:
-        for r in recs:
-            base = float(r.get("total", 0.0))
-            boosted = base * factor if r.get("city") == city else base
-            yield {**r, "total": round(boosted, 10)}  # stabilize floats
 
-    return _f
+def boost_city(city: str, factor: float) -> BoostCity:
+    return BoostCity(city, factor)
 
 
-def sort_by_total_desc() -> Callable[[Iterable[Record]], List[Record]]:
-    def _f(recs: Iterable[Record]) -> List[Record]:
-        return sorted(recs, key=lambda r: (-float(r.get("total", 0.0)), int(r.get("id", 0))))
+def _total_desc_key(r: Record) -> Tuple[float, int]:
+    return (-float(r.get("total", 0.0)), int(r.get("id", 0)))
 
-    return _f
 
+@dataclass(frozen=True)
+class SortByTotalDesc:
+    def __call__(self, recs: Iterable[Record]) -> List[Record]:
+        return sorted(recs, key=_total_desc_key)
 
-def take(n: int) -> Callable[[Iterable[Record]], List[Record]]:
-    def _f(recs: Iterable[Record]) -> List[Record]:
-        return list(islice(recs, n))
 
-    return _f
+@dataclass(frozen=True)
+class Take:
+    n: int
+
+    def __call__(self, recs: Iterable[Record]) -> List[Record]:
+        return list(islice(recs, self.n))
+
+
+@dataclass(frozen=True)
+class TopByTotalDesc:
+    """Bounded top-k: same result as ``take(n)(sort_by_total_desc()(recs))``.
+
+    ``heapq.nsmallest`` keeps only ``n`` records alive, so the stream is consumed
+    in O(len * log n) time and O(n) memory instead of a full sort.
+    """
+
+    n: int
+
+    def __call__(self, recs: Iterable[Record]) -> List[Record]:
+        return heapq.nsmallest(self.n, recs, key=_total_desc_key)
+
+
+def sort_by_total_desc() -> SortByTotalDesc:
+    return SortByTotalDesc()
+
+
+def take(n: int) -> Take:
+    return Take(n)
+
+
+def top_by_total_desc(n: int) -> TopByTotalDesc:
+    return TopByTotalDesc(n)
+
+
+# ---- Summation strategies ----
+
+Summation = Callable[[Iterable[float]], float]
+
+
+def float_sum(xs: Iterable[float]) -> float:
+    """Plain left-to-right float addition (the historical behaviour)."""
+    return reduce(operator.add, xs, 0.0)
+
+
+def neumaier_sum(xs: Iterable[float]) -> float:
+    """Kahan-Babuska (Neumaier) compensated sum: error stays O(1) ulp instead of O(n)."""
+    s = 0.0
+    c = 0.0
+    for x in xs:
+        t = s + x
+        if abs(s) >= abs(x):
+            c += (s - t) + x
+        else:
+            c += (x - t) + s
+        s = t
+    return s + c
+
+
+def cents_sum(xs: Iterable[float]) -> float:
+    """Fixed point: round every value to integer cents and add exactly as ints."""
+    return sum(round(x * 100) for x in xs) / 100
+
+
+# "fsum" and "cents" do not depend on input order or chunking; "neumaier" only
+# shrinks the error; "float" is the default.
+SUMMATIONS: Dict[str, Summation] = {
+    "float": float_sum,
+    "neumaier": neumaier_sum,
+    "fsum": math.fsum,
+    "cents": cents_sum,
+}
 
 
 # ---- Reductions / aggregations ----
 
 
-def reduce_stats(recs: Iterable[Record]) -> Dict[str, float]:
-    """Return count, sum_total, avg_total without mutating inputs."""
-    init: Dict[str, float] = {"count": 0.0, "sum_total": 0.0}
-    acc = reduce(
-        lambda a, r: {
-            "count": a["count"] + 1.0,
-            "sum_total": a["sum_total"] + float(r.get("total", 0.0)),
-        },
-        recs,
-        init,
-    )
-    avg = acc["sum_total"] / acc["count"] if acc["count"] else 0.0
-    return {"count": acc["count"], "sum_total": acc["sum_total"], "avg_total": avg}
+def reduce_stats(recs: Iterable[Record], summation: Summation = float_sum) -> Dict[str, float]:
+    """Return count, sum_total, avg_total without mutating inputs.
+
+    A thin wrapper over :class:`~lab2.stats.StatsAccumulator` without the
+    quantile sketch: ``sum_total`` is accumulated with ``summation`` in the
+    same single pass over ``recs``.
+    """
+    acc = StatsAccumulator(quantiles=False)
+    sum_total = summation(acc.feed(float(r.get("total", 0.0)) for r in recs))
+    avg = sum_total / acc.count if acc.count else 0.0
+    return {"count": float(acc.count), "sum_total": sum_total, "avg_total": avg}
+
+
+# ---- Pipeline planner ----
+
+RecordStage = Union[RecordMap, RecordFilter]
+Filter = Callable[[Mapping[str, Any]], bool]
+Update = Callable[[Dict[str, Any]], None]
+
+
+class FusedStage:
+    """A run of record-wise stages executed as one pass with at most one dict copy.
+
+    Filters whose ``reads`` are untouched by the maps before them are hoisted
+    to the front and checked on the input record, so rejected records cost no
+    copy and no map work. Hoisting stops at the first stage with undeclared
+    fields (``None``) and at the first filter that has to stay in place, so a
+    filter never overtakes either. The rest runs on a single private copy:
+    the leading maps, then each remaining filter followed by the maps after it.
+    """
+
+    __slots__ = ("stages", "_pre", "_updates", "_rest")
+
+    def __init__(self, stages: Sequence[RecordStage]) -> None:
+        self.stages: Tuple[RecordStage, ...] = tuple(stages)
+        pre: List[Filter] = []
+        updates: List[Update] = []
+        rest: List[Tuple[Filter, List[Update]]] = []
+        written: Optional[FrozenSet[str]] = frozenset()  # None: any field may have changed
+        hoist = True  # until a filter stays in place or an undeclared stage is seen
+        for st in self.stages:
+            if isinstance(st, RecordFilter):
+                reads = st.reads
+                if hoist and reads is not None and written is not None and not reads & written:
+                    pre.append(st.keep)
+                else:
+                    rest.append((st.keep, []))
+                    hoist = False
+            else:
+                (rest[-1][1] if rest else updates).append(st.update)
+                writes = st.writes
+                written = None if written is None or writes is None else written | writes
+                if written is None:
+                    hoist = False
+        self._pre = tuple(pre)
+        self._updates = tuple(updates)
+        self._rest = tuple((keep, tuple(more)) for keep, more in rest)
+
+    def __repr__(self) -> str:
+        return f"FusedStage({list(self.stages)!r})"
+
+    def __call__(self, recs: Iterable[Record]) -> Iterator[Record]:
+        if self._rest:
+            return self._run_checked(recs)
+        if self._updates:
+            return self._run(recs)
+        return self._run_filters(recs)
+
+    def _run_filters(self, recs: Iterable[Record]) -> Iterator[Record]:
+        pre = self._pre
+        for r in recs:
+            for keep in pre:
+                if not keep(r):
+                    break
+            else:
+                yield r
+
+    def _run(self, recs: Iterable[Record]) -> Iterator[Record]:
+        pre, updates = self._pre, self._updates
+        for r in recs:
+            for keep in pre:
+                if not keep(r):
+                    break
+            else:
+                out: Dict[str, Any] = dict(r)
+                for update in updates:
+                    update(out)
+                yield cast(Record, out)
+
+    def _run_checked(self, recs: Iterable[Record]) -> Iterator[Record]:
+        pre, updates, rest = self._pre, self._updates, self._rest
+        for r in recs:
+            for keep in pre:
+                if not keep(r):
+                    break
+            else:
+                out: Dict[str, Any] = dict(r)
+                for update in updates:
+                    update(out)
+                for keep, more in rest:
+                    if not keep(out):
+                        break
+                    for update in more:
+                        update(out)
+                else:
+                    yield cast(Record, out)
+
+
+def _rewrite_top_n(stages: Sequence[Unary]) -> List[Unary]:
+    out: List[Unary] = []
+    for st in stages:
+        prev = out[-1] if out else None
+        if isinstance(st, Take) and st.n >= 0 and isinstance(prev, SortByTotalDesc):
+            out[-1] = TopByTotalDesc(st.n)
+        else:
+            out.append(st)
+    return out
+
+
+def plan_pipeline(*stages: Unary) -> Unary:
+    """Left-to-right pipeline: ``plan_pipeline(f, g)(x) == g(f(x))``.
+
+    Consecutive built-in record-wise stages (``normalize_names``, ``only_adults``,
+    ``with_total``, ``boost_city`` or any ``RecordMap``/``RecordFilter``) are
+    fused into one ``FusedStage``; ``sort_by_total_desc()`` directly followed by
+    ``take(n)`` becomes ``top_by_total_desc(n)``; every other callable runs as an
+    opaque step.
+    """
+    planned: List[Unary] = []
+    run: List[RecordStage] = []
+    for st in _rewrite_top_n(stages):
+        if isinstance(st, (RecordMap, RecordFilter)):
+            run.append(st)
+            continue
+        if run:
+            planned.append(run[0] if len(run) == 1 else FusedStage(run))
+            run = []
+        planned.append(st)
+    if run:
+        planned.append(run[0] if len(run) == 1 else FusedStage(run))
+    return compose(*reversed(planned))
 
 
 # ---- Build pipeline ----
@@ -133,11 +487,11 @@ def build_pipeline(
     factor: float = 1.1,
 ) -> Callable[[Iterable[Record]], List[Record]]:
     """Return a composite function that transforms a stream of records."""
-    return compose(
-        take(top_n),
-        sort_by_total_desc(),
-        boost_city(city, factor),
-        with_total(),
-        only_adults(18),
+    return plan_pipeline(
         normalize_names(),
+        only_adults(18),
+        with_total(),
+        boost_city(city, factor),
+        sort_by_total_desc(),
+        take(top_n),
     )
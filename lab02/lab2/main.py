@@ -2,28 +2,41 @@ from __future__ import annotations
 
 import argparse
 import json
-from typing import List
 
-from .lab2 import Record, build_pipeline, reduce_stats
+from .lab2 import SUMMATIONS, build_pipeline, reduce_stats
+from .readers import FORMATS, detect_format, iter_records
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Lab 2: HOF pipeline demo")
-    parser.add_argument("--data", required=True, help="Path to JSON list of records")
+    parser.add_argument("--data", required=True, help="Path to JSON list or NDJSON of records")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="auto",
+        help="Input format; auto picks ndjson for .ndjson/.jsonl files",
+    )
     parser.add_argument("--top", type=int, default=3, help="Top-N to take")
     parser.add_argument("--boost-city", default="Delhi", help="City to boost totals for")
     parser.add_argument("--factor", type=float, default=1.1, help="Boost factor")
+    parser.add_argument(
+        "--summation",
+        choices=sorted(SUMMATIONS),
+        default="float",
+        help="Accumulation strategy for sum_total",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    with open(args.data, "r", encoding="utf-8") as f:
-        data: List[Record] = json.load(f)
+    fmt = detect_format(args.data) if args.format == "auto" else args.format
 
     pipeline = build_pipeline(top_n=args.top, city=args.boost_city, factor=args.factor)
-    top = pipeline(data)
-    stats = reduce_stats(top)
+    with open(args.data, "r", encoding="utf-8") as f:
+        # records are streamed straight into the pipeline; only the top-N stay in memory
+        top = pipeline(iter_records(f, fmt))
+    stats = reduce_stats(top, SUMMATIONS[args.summation])
 
     print("Top records:")
     for r in top:
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Iterator, TextIO, cast
+
+from .lab2 import Record
+
+FORMATS = ("auto", "json", "ndjson")
+
+_WS = re.compile(r"[ \t\r\n]*")
+# Characters that may still continue a number, up to the end of the buffer.
+_NUM_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+def iter_json_array(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[Record]:
+    """Yield the elements of a top-level JSON array one by one.
+
+    The file is read in ``chunk_size`` pieces and every element is decoded with
+    ``JSONDecoder.raw_decode`` as soon as it is complete, so memory is bounded
+    by the largest single element rather than by the whole document.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill(min_size: int) -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = f.read(max(chunk_size, min_size))
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws() -> str:
+        nonlocal pos
+        while True:
+            m = _WS.match(buf, pos)
+            if m:
+                pos = m.end()
+            if pos < len(buf):
+                return buf[pos]
+            if not fill(0):
+                return ""
+
+    if skip_ws() != "[":
+        raise ValueError("expected a top-level JSON array")
+    pos += 1
+    if skip_ws() == "]":
+        return
+
+    while True:
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if fill(len(buf) - pos):
+                continue  # element is split across chunks
+            raise
+        # A value ending at the buffer edge may be truncated, and so may a
+        # number followed only by number characters ("1." of "1.5"), so read
+        # on before trusting it.
+        split = end == len(buf) or (
+            type(value) in (int, float) and _NUM_TAIL.match(buf, end) is not None
+        )
+        if split and fill(len(buf) - pos):
+            continue
+        pos = end
+        yield cast(Record, value)
+
+        sep = skip_ws()
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"expected ',' or ']' in JSON array, got {sep or 'EOF'!r}")
+        pos += 1
+        skip_ws()
+
+
+def iter_ndjson(f: TextIO) -> Iterator[Record]:
+    """Yield one record per non-empty line (newline-delimited JSON)."""
+    for line in f:
+        if line.strip():
+            yield cast(Record, json.loads(line))
+
+
+def iter_records(f: TextIO, fmt: str = "json") -> Iterator[Record]:
+    """Stream records from ``f`` in the given format (``json`` or ``ndjson``)."""
+    if fmt == "json":
+        return iter_json_array(f)
+    if fmt == "ndjson":
+        return iter_ndjson(f)
+    raise ValueError(f"unknown format: {fmt!r}")
+
+
+def detect_format(path: str) -> str:
+    """Guess the format from the file extension: ``.ndjson``/``.jsonl`` → ndjson."""
+    return "ndjson" if path.endswith((".ndjson", ".jsonl")) else "json"
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Iterator, Optional
+
+
+class QuantileSketch:
+    """Mergeable approximate quantiles with bounded relative error (DDSketch-style).
+
+    Every finite value lands in a logarithmic bucket ``ceil(log_gamma(|x|))``;
+    a quantile estimate is within ``relative_accuracy`` of the true value.
+    Buckets are plain counts, so merging two sketches is exact and does not
+    depend on how the input was split. Non-finite values are ignored.
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma", "_inv_log_gamma", "_pos", "_neg", "_zeros", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+        self._pos: Dict[int, int] = {}
+        self._neg: Dict[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+
+    def add(self, x: float) -> None:
+        if x > 0.0:
+            if x != math.inf:
+                i = math.ceil(math.log(x) * self._inv_log_gamma)
+                self._pos[i] = self._pos.get(i, 0) + 1
+                self.count += 1
+        elif x < 0.0:
+            if x != -math.inf:
+                i = math.ceil(math.log(-x) * self._inv_log_gamma)
+                self._neg[i] = self._neg.get(i, 0) + 1
+                self.count += 1
+        elif x == 0.0:
+            self._zeros += 1
+            self.count += 1
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """Fold ``other`` into this sketch in place and return ``self``."""
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for i, c in other._pos.items():
+            self._pos[i] = self._pos.get(i, 0) + c
+        for i, c in other._neg.items():
+            self._neg[i] = self._neg.get(i, 0) + c
+        self._zeros += other._zeros
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Approximate ``q``-quantile (0 <= q <= 1) of the values seen so far."""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be in [0, 1]")
+        if not self.count:
+            raise ValueError("quantile of an empty sketch")
+        rank = q * (self.count - 1)
+        seen = 0
+        for i in sorted(self._neg, reverse=True):
+            seen += self._neg[i]
+            if seen > rank:
+                return -self._value(i)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for i in sorted(self._pos):
+            seen += self._pos[i]
+            if seen > rank:
+                return self._value(i)
+        return self._value(max(self._pos))  # pragma: no cover - rank < count
+
+    def _value(self, i: int) -> float:
+        return 2.0 * self._gamma**i / (self._gamma + 1.0)
+
+
+class StatsAccumulator:
+    """Single-pass, mergeable statistics over a stream of floats.
+
+    ``add`` updates count, sum, min, max, the running mean and the sum of
+    squared deviations (Welford) in place; ``merge`` combines two
+    accumulators with Chan's parallel formula, so chunks can be reduced
+    independently (e.g. in worker processes) and folded together afterwards.
+    With ``quantiles=False`` no sketch is kept, which makes ``add`` several
+    times cheaper when only the moments are needed.
+    """
+
+    __slots__ = ("count", "sum", "mean", "_m2", "min", "max", "sketch")
+
+    def __init__(self, relative_accuracy: float = 0.01, *, quantiles: bool = True) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch: Optional[QuantileSketch] = (
+            QuantileSketch(relative_accuracy) if quantiles else None
+        )
+
+    @classmethod
+    def from_values(
+        cls, xs: Iterable[float], relative_accuracy: float = 0.01, *, quantiles: bool = True
+    ) -> StatsAccumulator:
+        acc = cls(relative_accuracy, quantiles=quantiles)
+        for x in xs:
+            acc.add(x)
+        return acc
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        self.sum += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if self.sketch is not None:
+            self.sketch.add(x)
+
+    def feed(self, xs: Iterable[float]) -> Iterator[float]:
+        """Pass ``xs`` through unchanged while adding every value to the accumulator.
+
+        The moments are kept in locals and stored back once the iterator is
+        exhausted or closed, so read the accumulator after consuming the stream.
+        """
+        sketch_add = self.sketch.add if self.sketch is not None else None
+        n, total, mean, m2, lo, hi = self.count, self.sum, self.mean, self._m2, self.min, self.max
+        try:
+            for x in xs:
+                n += 1
+                total += x
+                delta = x - mean
+                mean += delta / n
+                m2 += delta * (x - mean)
+                if x < lo:
+                    lo = x
+                if x > hi:
+                    hi = x
+                if sketch_add is not None:
+                    sketch_add(x)
+                yield x
+        finally:
+            self.count, self.sum, self.mean = n, total, mean
+            self._m2, self.min, self.max = m2, lo, hi
+
+    def merge(self, other: StatsAccumulator) -> StatsAccumulator:
+        """Fold ``other`` into this accumulator in place and return ``self``."""
+        if (self.sketch is None) != (other.sketch is None):
+            raise ValueError("cannot merge accumulators with and without quantiles")
+        if not other.count:
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.mean += delta * other.count / n
+        self.count = n
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance (0.0 for fewer than two values)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def sample_variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile, clamped to the exact [min, max] range."""
+        if self.sketch is None:
+            raise ValueError("quantiles are disabled for this accumulator")
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+    def summary(self) -> Dict[str, float]:
+        out = {"count": float(self.count), "sum": self.sum, "mean": self.mean}
+        if self.count:
+            out.update(
+                min=self.min,
+                max=self.max,
+                variance=self.variance,
+                stddev=self.stddev,
+            )
+        # the sketch skips non-finite values, so it may be empty even when count is not
+        if self.sketch is not None and self.sketch.count:
+            out.update(p50=self.quantile(0.5), p90=self.quantile(0.9), p99=self.quantile(0.99))
+        return out
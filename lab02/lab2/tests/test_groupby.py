@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Hashable, Iterator, List
+
+import pytest
+
+from lab2.groupby import (
+    Aggregate,
+    GroupBy,
+    count,
+    group_by,
+    max_of,
+    mean_of,
+    min_of,
+    stats_of,
+    sum_of,
+)
+from lab2.lab2 import Record, compose, normalize_names, only_adults, pipe, with_total
+
+
+def make_records(n: int, seed: int = 0) -> List[Record]:
+    rnd = random.Random(seed)
+    cities = ["Delhi", "Kyiv", "Prague", "Oslo"]
+    return [
+        {
+            "id": i,
+            "name": f"user {i}",
+            "age": rnd.randint(10, 70),
+            "city": rnd.choice(cities),
+            "purchases": [float(rnd.randint(0, 100)) for _ in range(rnd.randint(0, 4))],
+        }
+        for i in range(n)
+    ]
+
+
+def by_key(rows: List[Dict[str, Any]], key: str) -> Dict[Any, Dict[str, Any]]:
+    return {row[key]: row for row in rows}
+
+
+def test_per_city_totals_in_one_pass() -> None:
+    data = make_records(300)
+    per_city = compose(
+        group_by("city", {"n": count(), "revenue": sum_of("total"), "top": max_of("total")}),
+        with_total(),
+        only_adults(18),
+    )
+    rows = list(per_city(data))
+    adults = [r for r in data if r["age"] >= 18]
+    assert [row["city"] for row in rows] == list(dict.fromkeys(r["city"] for r in adults))
+
+    for row in rows:
+        totals = [sum(r["purchases"]) for r in data if r["age"] >= 18 and r["city"] == row["city"]]
+        assert row["n"] == len(totals)
+        assert row["revenue"] == pytest.approx(sum(totals))
+        assert row["top"] == max(totals)
+
+
+def test_key_function_and_mean_min_stats() -> None:
+    data = list(with_total()(make_records(200, seed=1)))
+    aggs: Dict[str, Aggregate] = {
+        "lo": min_of("total"),
+        "avg": mean_of("total"),
+        "s": stats_of("total"),
+    }
+    rows = pipe(data, group_by(lambda r: r["age"] >= 40, aggs))
+    got = by_key(list(rows), "key")
+    assert set(got) == {True, False}
+    for flag, row in got.items():
+        totals = [r["total"] for r in data if (r["age"] >= 40) == flag]
+        assert row["lo"] == min(totals)
+        assert row["avg"] == pytest.approx(sum(totals) / len(totals))
+        assert row["s"]["count"] == len(totals)
+
+
+def test_stats_of_group_without_finite_values() -> None:
+    data: List[Record] = [{"id": 1, "city": "X", "total": float("inf")}, {"id": 2, "city": "Y"}]
+    rows = by_key(list(group_by("city", {"s": stats_of("total")})(data)), "city")
+    assert rows["X"]["s"]["count"] == 1.0 and "p50" not in rows["X"]["s"]
+    assert rows["Y"]["s"]["p50"] == 0.0
+
+
+@pytest.mark.parametrize("max_groups", [1, 3, 50])
+def test_spill_to_disk_matches_in_memory(max_groups: int, tmp_path: Any) -> None:
+    data = list(normalize_names()(make_records(500, seed=2)))
+    aggs: Dict[str, Aggregate] = {
+        "n": count(),
+        "revenue": sum_of("age"),
+        "avg": mean_of("age"),
+        "hi": max_of("age"),
+    }
+    expected = by_key(list(group_by("id", aggs)(data + data)), "id")
+    spilled = group_by("id", aggs, max_groups=max_groups, partitions=4, spill_dir=str(tmp_path))
+    got = by_key(list(spilled(data + data)), "id")
+    assert got == expected
+    assert all(row["n"] == 2 for row in got.values())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_float_aggregates_match_within_rounding(tmp_path: Any) -> None:
+    rnd = random.Random(4)
+    data: List[Record] = [
+        {"id": i, "city": rnd.choice("ABCDEFGH"), "total": rnd.uniform(-1e6, 1e6)}
+        for i in range(2000)
+    ]
+    aggs: Dict[str, Aggregate] = {
+        "n": count(),
+        "sum": sum_of("total"),
+        "avg": mean_of("total"),
+        "lo": min_of("total"),
+        "s": stats_of("total"),
+    }
+    expected = by_key(list(group_by("city", aggs)(data)), "city")
+    spilled = group_by("city", aggs, max_groups=2, partitions=2, spill_dir=str(tmp_path))
+    got = by_key(list(spilled(data)), "city")
+
+    assert set(got) == set(expected)
+    for city, row in got.items():
+        want = expected[city]
+        assert row["n"] == want["n"] and row["lo"] == want["lo"]  # exact aggregates
+        assert row["sum"] == pytest.approx(want["sum"], rel=1e-12, abs=1e-6)
+        assert row["avg"] == pytest.approx(want["avg"], rel=1e-12, abs=1e-9)
+        assert row["s"]["variance"] == pytest.approx(want["s"]["variance"], rel=1e-9)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spilled_partitions_are_split_until_they_fit(tmp_path: Any) -> None:
+    sizes: List[int] = []
+
+    class Probe(GroupBy):
+        def _rows(self, table: Dict[Hashable, List[Any]]) -> Iterator[Dict[str, Any]]:
+            sizes.append(len(table))
+            return super()._rows(table)
+
+    g = group_by("id", {"n": count()})
+    probe = Probe(g.key, g.key_name, g.aggs, max_groups=3, partitions=2, spill_dir=str(tmp_path))
+    data = make_records(200, seed=3)
+    got = by_key(list(probe(data + data)), "id")
+
+    assert got == {i: {"id": i, "n": 2} for i in range(200)}
+    assert max(sizes) <= 3  # the merge phase never holds more than max_groups keys
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_validation() -> None:
+    with pytest.raises(ValueError):
+        group_by("city", {})
+    with pytest.raises(ValueError):
+        group_by("city", {"n": count()}, max_groups=0)
+    assert list(group_by("city", {"n": count()})([])) == []
@@ -1,9 +1,32 @@
 from __future__ import annotations
 
 import copy
-from typing import List
+import random
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, FrozenSet, Iterable, Iterator, List, Mapping
 
-from lab2.lab2 import Record, build_pipeline, reduce_stats
+import pytest
+
+from lab2.lab2 import (
+    SUMMATIONS,
+    FusedStage,
+    NormalizeNames,
+    Record,
+    RecordFilter,
+    RecordMap,
+    boost_city,
+    build_pipeline,
+    compose,
+    normalize_names,
+    only_adults,
+    pipe,
+    plan_pipeline,
+    reduce_stats,
+    sort_by_total_desc,
+    take,
+    top_by_total_desc,
+    with_total,
+)
 
 
 def test_pipeline_top_and_sort() -> None:
@@ -31,6 +54,32 @@ def test_no_mutation() -> None:
     assert data == original, "Input must not be mutated"
 
 
+@pytest.mark.parametrize("codegen", [False, True])
+@pytest.mark.parametrize("n", range(7))
+def test_compose_matches_nested_calls(n: int, codegen: bool) -> None:
+    funcs = [lambda x, i=i: x * 10 + i for i in range(1, n + 1)]
+    expected = 0
+    for f in reversed(funcs):
+        expected = f(expected)
+    assert compose(*funcs, codegen=codegen)(0) == expected
+    assert pipe(0, *reversed(funcs)) == expected
+
+
+def test_compose_flattens_nested_compositions() -> None:
+    def inc(x: int) -> int:
+        return x + 1
+
+    def dbl(x: int) -> int:
+        return x * 2
+
+    inner = compose(dbl, inc)
+    outer = compose(inc, inner, compose(dbl, dbl, inc, inc), codegen=True)
+    assert outer(1) == inc(dbl(inc(dbl(dbl(inc(inc(1)))))))
+    assert getattr(outer, "_compose_chain") == (inc, inc, dbl, dbl, inc, dbl, inc)
+    assert compose(inc) is inc
+    assert compose()(5) == 5
+
+
 def test_reduce_stats() -> None:
     data: List[Record] = [
         {"id": 1, "name": "x", "age": 19, "city": "Delhi", "purchases": [10]},
@@ -42,3 +91,119 @@ def test_reduce_stats() -> None:
     assert stats["count"] == 2.0
     assert abs(stats["sum_total"] - 16.0) < 1e-9
     assert abs(stats["avg_total"] - 8.0) < 1e-9
+
+
+@pytest.mark.parametrize("name", ["fsum", "cents"])
+def test_reduce_stats_exact_summation_is_order_independent(name: str) -> None:
+    rnd = random.Random(5)
+    data: List[Record] = [{"id": i, "total": rnd.uniform(0.01, 1e7)} for i in range(500)]
+    shuffled = data[:]
+    rnd.shuffle(shuffled)
+    a = reduce_stats(data, SUMMATIONS[name])
+    b = reduce_stats(iter(shuffled), SUMMATIONS[name])
+    assert a == b
+    assert a["count"] == 500.0
+
+
+def test_summation_strategies() -> None:
+    xs = [0.1] * 10 + [1e16, 1.0, -1e16]
+    assert SUMMATIONS["fsum"](xs) == 2.0
+    assert SUMMATIONS["neumaier"](xs) == 2.0
+    assert SUMMATIONS["float"](xs) != 2.0  # plain addition loses the 1.0
+    assert SUMMATIONS["cents"]([0.1, 0.2, 0.3]) == 0.6
+
+
+def _sample_records() -> List[Record]:
+    rnd = random.Random(9)
+    return [
+        {
+            "id": i,
+            "name": f"  user {i} ",
+            "age": rnd.randint(10, 40),
+            "city": rnd.choice(["Delhi", "Kyiv"]),
+            "purchases": [rnd.uniform(0, 50) for _ in range(rnd.randint(0, 3))],
+        }
+        for i in range(200)
+    ]
+
+
+def test_fused_stages_match_unfused() -> None:
+    stages = (normalize_names(), only_adults(21), with_total(), boost_city("Kyiv", 1.5))
+    data = _sample_records()
+    unfused = compose(*reversed(stages))(data)
+    fused_pipeline = plan_pipeline(*stages)
+    assert list(fused_pipeline(data)) == list(unfused)
+    assert isinstance(FusedStage(stages).stages[0], NormalizeNames)
+
+
+def test_fused_filter_skips_work_for_rejected_records() -> None:
+    seen: List[Any] = []
+
+    @dataclass(frozen=True)
+    class Spy(RecordMap):
+        writes: ClassVar[FrozenSet[str]] = frozenset({"name"})
+
+        def update(self, r: Dict[str, Any]) -> None:
+            seen.append(r["id"])
+
+    data: List[Record] = [{"id": 1, "age": 30}, {"id": 2, "age": 5}]
+    out = list(plan_pipeline(Spy(), only_adults(18))(data))
+    assert [r["id"] for r in out] == [1]
+    assert seen == [1]  # only_adults reads "age" only, so it ran before Spy
+
+
+def test_fused_keeps_order_after_undeclared_writes() -> None:
+    @dataclass(frozen=True)
+    class Grow(RecordMap):  # no ``writes``: may touch any field
+        def update(self, r: Dict[str, Any]) -> None:
+            r["age"] = 99
+
+    data: List[Record] = [{"id": 1, "age": 5}]
+    stages = (Grow(), only_adults(18), with_total(), only_adults(50))
+    expected = list(compose(*reversed(stages))(data))
+    assert expected == [{"id": 1, "age": 99, "total": 0.0}]
+    assert list(plan_pipeline(*stages)(data)) == expected
+
+
+def test_fused_never_hoists_past_an_undeclared_filter() -> None:
+    @dataclass(frozen=True)
+    class HasAge(RecordFilter):  # no ``reads``: may look at any field
+        def keep(self, r: Mapping[str, Any]) -> bool:
+            return r.get("age") is not None
+
+    data: List[Record] = [
+        {"id": 1, "name": " a ", "age": None},  # type: ignore[typeddict-item]
+        {"id": 2, "name": "b", "age": 30},
+    ]
+    expected = list(only_adults(18)(HasAge()(normalize_names()(data))))
+    assert [r["id"] for r in expected] == [2]
+    assert list(plan_pipeline(normalize_names(), HasAge(), only_adults(18))(data)) == expected
+
+
+def test_record_stages_are_abstract() -> None:
+    class Incomplete(RecordMap):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
+
+
+def test_plan_pipeline_keeps_opaque_stages() -> None:
+    def drop_odd_ids(recs: Iterable[Record]) -> Iterator[Record]:
+        return (r for r in recs if r["id"] % 2 == 0)
+
+    data = _sample_records()
+    pipeline = plan_pipeline(normalize_names(), drop_odd_ids, with_total(), list)
+    out = pipeline(data)
+    assert [r["id"] for r in out] == list(range(0, 200, 2))
+    assert out[0]["name"] == "User 0" and "total" in out[0]
+
+
+def test_top_by_total_desc_matches_sort_then_take() -> None:
+    rnd = random.Random(2)
+    data: List[Record] = [{"id": i, "total": float(rnd.randint(0, 5))} for i in range(300)]
+    rnd.shuffle(data)
+    for n in (0, 1, 3, 50, 500):
+        expected = take(n)(sort_by_total_desc()(data))
+        assert top_by_total_desc(n)(iter(data)) == expected  # ties broken by id
+        assert plan_pipeline(sort_by_total_desc(), take(n))(iter(data)) == expected
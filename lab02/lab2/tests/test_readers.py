@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from lab2.lab2 import build_pipeline
+from lab2.readers import detect_format, iter_json_array, iter_ndjson, iter_records
+
+SAMPLE = Path(__file__).resolve().parents[1] / "sample_data.json"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+def test_json_array_streaming_matches_json_load(chunk_size: int) -> None:
+    text = SAMPLE.read_text(encoding="utf-8")
+    expected = json.loads(text)
+    got = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+    assert got == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[]",
+        "  [ ]  ",
+        "[1, 23, 456]",
+        '[{"a": [1, 2]}, "x", null]',
+        "[1.5]",
+        "[10.25, 3]",
+        "[-0.5e-3, 1E+2, 7, 12345678901234567890]",
+    ],
+)
+def test_json_array_edge_cases(text: str, chunk_size: int) -> None:
+    expected: List[Any] = json.loads(text)
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("text", ['{"id": 1}', "[1, 2", "[1 2]", "[1,]", '[{"id": 1'])
+def test_json_array_rejects_malformed_input(text: str) -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), chunk_size=3))
+
+
+def test_json_array_is_lazy() -> None:
+    stream = io.StringIO('[{"id": 1}, {"id": 2}, this is not json')
+    it = iter_json_array(stream, chunk_size=4)
+    assert next(it) == {"id": 1}
+    assert next(it) == {"id": 2}
+    with pytest.raises(ValueError):
+        next(it)
+
+
+def test_ndjson_and_pipeline() -> None:
+    data = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    ndjson = "\n".join(json.dumps(r) for r in data) + "\n\n"
+    assert list(iter_ndjson(io.StringIO(ndjson))) == data
+
+    pipeline = build_pipeline(top_n=3)
+    assert pipeline(iter_records(io.StringIO(ndjson), "ndjson")) == pipeline(data)
+
+
+def test_detect_format() -> None:
+    assert detect_format("orders.ndjson") == "ndjson"
+    assert detect_format("orders.jsonl") == "ndjson"
+    assert detect_format("orders.json") == "json"
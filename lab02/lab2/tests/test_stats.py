@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import math
+import random
+import statistics
+from functools import reduce
+from typing import List
+
+import pytest
+
+from lab2.stats import QuantileSketch, StatsAccumulator
+
+
+def make_values(n: int = 2000, seed: int = 3) -> List[float]:
+    rnd = random.Random(seed)
+    return [rnd.lognormvariate(3.0, 1.0) - 20.0 for _ in range(n)] + [0.0, 0.0]
+
+
+def test_accumulator_matches_statistics() -> None:
+    xs = make_values()
+    acc = StatsAccumulator.from_values(xs)
+    assert acc.count == len(xs)
+    assert acc.sum == pytest.approx(math.fsum(xs))
+    assert acc.mean == pytest.approx(statistics.fmean(xs))
+    assert acc.min == min(xs) and acc.max == max(xs)
+    assert acc.variance == pytest.approx(statistics.pvariance(xs))
+    assert acc.sample_variance == pytest.approx(statistics.variance(xs))
+
+
+def test_merge_of_chunks_equals_single_pass() -> None:
+    xs = make_values()
+    whole = StatsAccumulator.from_values(xs)
+    parts = [StatsAccumulator.from_values(xs[i : i + 300]) for i in range(0, len(xs), 300)]
+    merged = reduce(StatsAccumulator.merge, parts, StatsAccumulator())
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.variance == pytest.approx(whole.variance)
+    assert (merged.min, merged.max) == (whole.min, whole.max)
+    for q in (0.0, 0.1, 0.5, 0.9, 0.99, 1.0):
+        assert merged.quantile(q) == whole.quantile(q)
+
+
+@pytest.mark.parametrize("q", [0.01, 0.25, 0.5, 0.75, 0.9, 0.99])
+def test_quantiles_within_relative_accuracy(q: float) -> None:
+    xs = make_values(5000)
+    acc = StatsAccumulator.from_values(xs, relative_accuracy=0.01)
+    exact = sorted(xs)[int(q * (len(xs) - 1))]
+    assert abs(acc.quantile(q) - exact) <= 0.01 * abs(exact) + 1e-12
+
+
+def test_empty_and_degenerate() -> None:
+    acc = StatsAccumulator()
+    assert acc.summary() == {"count": 0.0, "sum": 0.0, "mean": 0.0}
+    with pytest.raises(ValueError):
+        acc.quantile(0.5)
+    acc.merge(StatsAccumulator())
+    assert acc.count == 0
+
+    acc.add(4.0)
+    assert acc.variance == 0.0
+    assert acc.quantile(0.5) == 4.0
+    with pytest.raises(ValueError):
+        acc.quantile(1.5)
+
+
+def test_sketch_ignores_non_finite_and_checks_accuracy() -> None:
+    sketch = QuantileSketch()
+    for x in (math.inf, -math.inf, math.nan, 1.0):
+        sketch.add(x)
+    assert sketch.count == 1
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(0.05))
+
+
+def test_summary_without_finite_values_has_no_quantiles() -> None:
+    acc = StatsAccumulator.from_values([math.inf, -math.inf])
+    summary = acc.summary()
+    assert summary["count"] == 2.0 and "p50" not in summary
+    assert (summary["min"], summary["max"]) == (-math.inf, math.inf)
+
+
+def test_accumulator_without_quantiles() -> None:
+    xs = make_values()
+    full = StatsAccumulator.from_values(xs)
+    plain = StatsAccumulator(quantiles=False)
+    assert list(plain.feed(iter(xs))) == xs
+    assert plain.sketch is None
+    assert (plain.count, plain.sum, plain.mean, plain.variance) == (
+        full.count,
+        full.sum,
+        full.mean,
+        full.variance,
+    )
+    assert plain.summary() == {
+        k: v for k, v in full.summary().items() if k not in ("p50", "p90", "p99")
+    }
+    with pytest.raises(ValueError):
+        plain.quantile(0.5)
+    with pytest.raises(ValueError):
+        plain.merge(full)
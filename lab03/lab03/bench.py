@@ -0,0 +1,182 @@
+"""Microbenchmarks for immutable order updates.
+
+Run: ``python -m lab03.bench [--orders N] [--repeat R]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, List, Mapping, Tuple, TypeVar
+
+from .core import evolve, top_expensive_items
+from .model import Item, Order, OrderDraft, make_meta
+from .table import OrderTable
+
+# 20 updates: 12 items, 4 tags, 3 meta patches, 1 payment
+ITEMS = [Item(f"SKU{i}", 9.99 + i, i % 3 + 1) for i in range(12)]
+TAGS = ["gift", "priority", "web", "promo"]
+META = [{"source": "web"}, {"campaign": "autumn"}, {"step": "checkout"}]
+
+
+def make_orders(n: int, items_per_order: int = 50) -> List[Order]:
+    base = tuple(Item(f"B{i}", 1.0 + i % 10, 1) for i in range(items_per_order))
+    return [
+        Order(id=i, paid=False, items=base, tags=frozenset({"new"}), meta=make_meta(src="bench"))
+        for i in range(n)
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class LegacyOrder:
+    """``Order`` as it was before the cached subtotal: plain fields, no extra slot."""
+
+    id: int
+    paid: bool
+    items: Tuple[Item, ...]
+    tags: frozenset[str]
+    meta: Mapping[str, str] = field(compare=False, hash=False)
+
+
+def legacy(o: Order) -> LegacyOrder:
+    return LegacyOrder(o.id, o.paid, tuple(o.items), o.tags, o.meta)
+
+
+def state(o: Any) -> Tuple[Any, ...]:
+    return (o.id, o.paid, tuple(o.items), o.tags, dict(o.meta))
+
+
+AnyOrder = TypeVar("AnyOrder", Order, LegacyOrder)
+
+
+def replace_chain(o: AnyOrder) -> AnyOrder:
+    """The original per-step ``dataclasses.replace`` updates."""
+    for item in ITEMS:
+        o = replace(o, items=tuple(o.items) + (item,))
+    for tag in TAGS:
+        o = replace(o, tags=o.tags | frozenset({tag}))
+    for patch in META:
+        merged = dict(o.meta)
+        merged.update(patch)
+        o = replace(o, meta=MappingProxyType(merged))
+    return replace(o, paid=True)
+
+
+def method_chain(o: Order) -> Order:
+    for item in ITEMS:
+        o = o.with_item(item)
+    for tag in TAGS:
+        o = o.add_tag(tag)
+    for patch in META:
+        o = o.with_meta(**patch)
+    return o.pay()
+
+
+def recipe(d: OrderDraft) -> None:
+    for item in ITEMS:
+        d.with_item(item)
+    for tag in TAGS:
+        d.add_tag(tag)
+    for patch in META:
+        d.with_meta(**patch)
+    d.pay()
+
+
+def evolve_chain(o: Order) -> Order:
+    return evolve(o, recipe)
+
+
+def report(label: str, fn: Callable[[], object], repeat: int, n: int, unit: str = "order") -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"  {label:<30} {best * 1e3:9.2f} ms  {best / n * 1e6:8.3f} us/{unit}")
+    return best
+
+
+def bench_update_chain(orders: List[Order], repeat: int) -> None:
+    print(f"20-step update chain ({len(orders)} orders)")
+    olds = [legacy(o) for o in orders]
+    expected = [state(replace_chain(o)) for o in olds]
+    assert [state(method_chain(o)) for o in orders] == expected
+    assert [state(evolve_chain(o)) for o in orders] == expected
+
+    # the baseline runs on the pre-series Order; ``replace`` on today's Order is shown
+    # separately and should match it, since the subtotal is only summed on first use
+    base = report(
+        "replace, old Order (baseline)", lambda: list(map(replace_chain, olds)), repeat, len(orders)
+    )
+    report("replace, current Order", lambda: list(map(replace_chain, orders)), repeat, len(orders))
+    report("pure methods per step", lambda: list(map(method_chain, orders)), repeat, len(orders))
+    best = report(
+        "evolve (one draft)", lambda: list(map(evolve_chain, orders)), repeat, len(orders)
+    )
+    print(f"  speedup vs baseline: x{base / best:.2f}")
+
+
+def bench_top_items(m: int, repeat: int, n: int = 5) -> None:
+    rnd = random.Random(0)
+    items = [Item(f"S{i}", round(rnd.uniform(1, 500), 2), rnd.randint(1, 9)) for i in range(m)]
+    print(f"top-{n} of {m} items")
+    expected = tuple(sorted(items, key=lambda i: i.total, reverse=True)[:n])
+    assert top_expensive_items(items, n) == expected
+
+    base = report(
+        "sorted + slice (baseline)",
+        lambda: tuple(sorted(items, key=lambda i: i.total, reverse=True)[:n]),
+        repeat,
+        m,
+        "item",
+    )
+    best = report("top_expensive_items", lambda: top_expensive_items(items, n), repeat, m, "item")
+    print(f"  speedup vs baseline: x{base / best:.2f}")
+
+
+def traced_bytes(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+        del keep
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def bench_table(n: int, repeat: int) -> None:
+    print(f"OrderTable vs Order objects ({n} orders)")
+
+    def fresh_orders() -> Iterator[Order]:
+        for i in range(n):
+            items = tuple(Item(f"SKU{(i + k) % 500}", 1.0 + k, k + 1) for k in range(4))
+            yield Order(i, i % 2 == 0, items, frozenset({"web", f"t{i % 8}"}), make_meta())
+
+    objects = traced_bytes(lambda: list(fresh_orders()))
+    table = traced_bytes(lambda: OrderTable(fresh_orders()))
+    print(f"  Order objects  {objects / n:9.1f} B/order")
+    print(f"  OrderTable     {table / n:9.1f} B/order   x{objects / table:.1f} smaller")
+
+    orders = list(fresh_orders())
+    columns = OrderTable(orders)
+    base = report("Order.subtotal() per order", lambda: [o.subtotal() for o in orders], repeat, n)
+    best = report("OrderTable.subtotals()", columns.subtotals, repeat, n)
+    print(f"  speedup vs baseline: x{base / best:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lab 3 immutable update microbenchmarks")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--items", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bench_update_chain(make_orders(args.orders), args.repeat)
+    bench_top_items(args.items, args.repeat)
+    bench_table(args.orders, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
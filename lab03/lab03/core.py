@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import heapq
+import operator
 from collections.abc import Mapping as ABMapping
 from types import MappingProxyType
-from typing import Any, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
-from .model import Item, Order
+from .model import Item, Order, OrderDraft
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None  # type: ignore[assignment]
 
 
 # ---- pure update functions (no in-place mutation) ----
@@ -20,19 +27,186 @@ def pay(order: Order) -> Order:
     return order.pay()
 
 
+def evolve(order: Order, recipe: Callable[[OrderDraft], Any]) -> Order:
+    """Apply many updates through one mutable draft and freeze once.
+
+    ``evolve(o, lambda d: d.add_item("A", 1.0, 2).add_tag("x").pay())`` builds a
+    single new ``Order`` instead of one intermediate order per step.
+    """
+    draft = OrderDraft(order)
+    recipe(draft)
+    return draft.freeze()
+
+
 # ---- read helpers ----
+_item_total = operator.attrgetter("total")
+
+# below this many items the per-call NumPy overhead outweighs the vectorised scan
+_VECTOR_MIN_ITEMS = 2048
+
+
 def top_expensive_items(items: Sequence[Item], n: int = 3) -> Tuple[Item, ...]:
-    return tuple(sorted(items, key=lambda i: i.total, reverse=True)[:n])
+    """The ``n`` items with the largest ``total``, equal totals in input order.
+
+    Same result as ``tuple(sorted(items, key=total, reverse=True)[:n])`` but a
+    partial selection: ``heapq.nlargest`` runs in O(m log n), and large inputs
+    go through a vectorised NumPy path when it is installed.
+    """
+    if n < 0:
+        return tuple(sorted(items, key=_item_total, reverse=True)[:n])
+    if np is not None and len(items) >= _VECTOR_MIN_ITEMS and n:
+        top = _top_vectorised(items, n)
+        if top is not None:
+            return top
+    return tuple(heapq.nlargest(n, items, key=_item_total))
+
+
+def _top_vectorised(items: Sequence[Item], n: int) -> Optional[Tuple[Item, ...]]:
+    m = len(items)
+    prices = np.fromiter((i.price for i in items), dtype=np.float64, count=m)
+    qtys = np.fromiter((i.qty for i in items), dtype=np.float64, count=m)
+    totals = prices * qtys
+    if np.isnan(totals).any():
+        return None  # NaN ordering follows the Python sort, leave it to the scalar path
+    if n < m:
+        # every item tied with the n-th largest total is a candidate; a stable sort
+        # of the candidates (already in input order) then breaks ties by position
+        threshold = np.partition(totals, m - n)[m - n]
+        candidates = np.flatnonzero(totals >= threshold)
+    else:
+        candidates = np.arange(m)
+    order = candidates[np.argsort(-totals[candidates], kind="stable")[:n]]
+    return tuple(items[i] for i in order.tolist())
 
 
 # ---- optional: deep freeze utility ----
-def freeze(obj: Any) -> Any:
-    """Deep-freeze: Mapping→MappingProxyType; set→frozenset; list/tuple→tuple."""
-    if isinstance(obj, ABMapping):
-        frozen_inner = {k: freeze(v) for k, v in obj.items()}
-        return MappingProxyType(frozen_inner)
-    if isinstance(obj, set):
-        return frozenset(freeze(x) for x in obj)
-    if isinstance(obj, (list, tuple)):
-        return tuple(freeze(x) for x in obj)
-    return obj
+_ATOMS = frozenset({str, int, float, bool, complex, bytes, type(None)})
+_CONTAINERS = (ABMapping, set, list, tuple)
+
+
+def freeze(obj: Any, *, intern: bool = False, pool: Optional[Dict[Any, Any]] = None) -> Any:
+    """Deep-freeze: Mapping→MappingProxyType; set→frozenset; list/tuple→tuple.
+
+    The traversal uses an explicit stack, so depth is not limited by the
+    recursion limit, and an identity memo, so a container shared by several
+    parents is frozen once and the result is shared the same way. Containers
+    that are already frozen (a tuple, or a ``MappingProxyType`` whose values
+    freeze to themselves) are returned as is, so ``freeze(freeze(x))`` copies
+    nothing. Cycles are supported when they pass through a dict (its proxy is
+    created before its contents); any other cycle cannot be represented with
+    tuples and frozensets and raises ``ValueError``.
+
+    With ``intern=True`` equal frozen containers are hash-consed into one shared
+    object; pass the same ``pool`` dict to share them across calls. Interning
+    needs an acyclic input.
+    """
+    if type(obj) in _ATOMS or not isinstance(obj, _CONTAINERS):
+        return obj
+    if pool is not None:
+        intern = True
+    elif intern:
+        pool = {}
+    memo: Dict[int, Any] = {}
+    active: Set[int] = set()  # containers waiting for their children
+    fills: List[Tuple[ABMapping[Any, Any], Dict[Any, Any]]] = []  # proxies created, dicts empty
+    stack: List[Any] = [obj]
+
+    atoms, containers = _ATOMS, _CONTAINERS
+    while stack or fills:
+        if not stack:
+            src, target = fills[-1]
+            pending = [
+                v
+                for v in src.values()
+                if type(v) not in atoms and isinstance(v, containers) and id(v) not in memo
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            fills.pop()
+            for k, v in src.items():
+                target[k] = memo.get(id(v), v)
+            continue
+
+        x = stack[-1]
+        key = id(x)
+        if key in memo:
+            stack.pop()
+            continue
+        if not intern and isinstance(x, ABMapping):
+            stack.pop()
+            if isinstance(x, MappingProxyType) and _deep_frozen(x, memo):
+                continue
+            # publish the proxy before the contents, so cycles through x resolve to it
+            dst: Dict[Any, Any] = {}
+            memo[key] = MappingProxyType(dst)
+            fills.append((x, dst))
+            continue
+
+        children = list(x.values()) if isinstance(x, ABMapping) else list(x)
+        pending = [
+            c
+            for c in children
+            if type(c) not in atoms and isinstance(c, containers) and id(c) not in memo
+        ]
+        if pending:
+            active.add(key)
+            for c in pending:
+                if id(c) in active:
+                    raise ValueError("cannot freeze a cycle that does not pass through a dict")
+                stack.append(c)
+            continue
+
+        stack.pop()
+        active.discard(key)
+        frozen = [memo.get(id(c), c) for c in children]
+        value = _rebuild(x, frozen)
+        if pool is not None:
+            value = pool.setdefault(_intern_key(x, value, frozen), value)
+        memo[key] = value
+
+    return memo[id(obj)]
+
+
+def _deep_frozen(root: Any, memo: Dict[int, Any]) -> bool:
+    """True if nothing mutable is reachable from ``root``; then memoize the subtree as is."""
+    seen: Dict[int, Any] = {id(root): root}
+    todo = [root]
+    while todo:
+        x = todo.pop()
+        for c in x.values() if isinstance(x, ABMapping) else x:
+            if type(c) in _ATOMS or not isinstance(c, _CONTAINERS) or id(c) in memo:
+                continue
+            if id(c) in seen:
+                continue
+            if not isinstance(c, (MappingProxyType, tuple)):
+                return False
+            seen[id(c)] = c
+            todo.append(c)
+    memo.update(seen)
+    return True
+
+
+def _rebuild(x: Any, frozen: List[Any]) -> Any:
+    """Frozen counterpart of ``x`` given its frozen children; reuses ``x`` if nothing changed."""
+    if isinstance(x, ABMapping):
+        if isinstance(x, MappingProxyType) and all(map(operator.is_, frozen, x.values())):
+            return x
+        return MappingProxyType(dict(zip(x.keys(), frozen)))
+    if isinstance(x, set):
+        return frozenset(frozen)
+    if isinstance(x, tuple) and all(map(operator.is_, frozen, x)):
+        return x
+    return tuple(frozen)
+
+
+def _intern_key(x: Any, value: Any, frozen: List[Any]) -> Tuple[Any, ...]:
+    # children are already canonical, so containers are keyed by identity and
+    # atoms by (type, value) to keep 1, 1.0 and True apart
+    ids = tuple((type(c), c) if type(c) in _ATOMS else id(c) for c in frozen)
+    if isinstance(value, MappingProxyType):
+        keys = tuple((type(k), k) for k in x.keys())
+        return (MappingProxyType, keys, ids)
+    if isinstance(value, frozenset):
+        return (frozenset, frozenset(ids))
+    return (tuple, ids)
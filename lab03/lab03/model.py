@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, replace
+from dataclasses import dataclass, field
 from types import MappingProxyType
-from typing import Any, Mapping, NamedTuple, Tuple
+from typing import Any, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .pvector import ItemVector, items_total
 
 
 class Item(NamedTuple):
@@ -15,16 +17,38 @@ class Item(NamedTuple):
         return self.price * self.qty
 
 
+_set = object.__setattr__  # frozen dataclass fields are written through object.__setattr__
+
+
 def make_meta(**kwargs: str) -> Mapping[str, str]:
     """Return a read-only mapping for metadata."""
     return MappingProxyType(dict(kwargs))
 
 
+# ``with_item`` switches ``items`` to a persistent ItemVector, which compares and
+# hashes like the equivalent tuple.
+Items = Union[Tuple[Item, ...], ItemVector]
+
+
+def _subtotal_of(items: Items) -> float:
+    # a vector's running total is added in the same order as ``items_total``,
+    # so equal orders have equal subtotals however their items were built
+    return items.total if isinstance(items, ItemVector) else items_total(items)
+
+
+class _SubtotalSlot:
+    # The cached subtotal lives in a slot of this base class rather than in a
+    # dataclass field, so ``fields``/``asdict``/``replace`` never see it.
+    __slots__ = ("_subtotal",)
+
+    _subtotal: float
+
+
 @dataclass(frozen=True, slots=True)
-class Order:
+class Order(_SubtotalSlot):
     id: int
     paid: bool
-    items: Tuple[Item, ...]
+    items: Items
     tags: frozenset[str]
     # exclude meta from hashing/eq; MappingProxyType isn't hashable
     meta: Mapping[str, str] = field(compare=False, hash=False)
@@ -39,18 +63,109 @@ class Order:
     # ---- pure methods: return NEW Order instances ----
 
     def subtotal(self) -> float:
-        return sum(i.total for i in self.items)
+        # summed on first use, then carried forward by the pure methods below
+        try:
+            return self._subtotal
+        except AttributeError:
+            subtotal = _subtotal_of(self.items)
+            _set(self, "_subtotal", subtotal)
+            return subtotal
 
     def add_tag(self, tag: str) -> "Order":
-        return replace(self, tags=self.tags | frozenset({tag}))
+        return self._derive(self.paid, self.items, self.tags | frozenset({tag}), self.meta)
 
     def with_item(self, item: Item) -> "Order":
-        return replace(self, items=self.items + (item,))
+        # amortised O(1) append with structural sharing instead of copying the tuple
+        items = self.items if isinstance(self.items, ItemVector) else ItemVector(self.items)
+        items = items.append(item)
+        return self._derive(self.paid, items, self.tags, self.meta, items.total)
 
     def pay(self) -> "Order":
-        return self if self.paid else replace(self, paid=True)
+        return self if self.paid else self._derive(True, self.items, self.tags, self.meta)
 
     def with_meta(self, **patch: str) -> "Order":
         merged = dict(self.meta)
         merged.update(patch)
-        return replace(self, meta=MappingProxyType(merged))
+        return self._derive(self.paid, self.items, self.tags, MappingProxyType(merged))
+
+    def _derive(
+        self,
+        paid: bool,
+        items: Items,
+        tags: frozenset[str],
+        meta: Mapping[str, str],
+        subtotal: Optional[float] = None,
+    ) -> "Order":
+        """Sibling order with the same ``id``; skips ``__init__`` and reuses the subtotal."""
+        if subtotal is None:
+            subtotal = getattr(self, "_subtotal", None)
+        new = object.__new__(Order)
+        _set(new, "id", self.id)
+        _set(new, "paid", paid)
+        _set(new, "items", items)
+        _set(new, "tags", tags)
+        _set(new, "meta", meta)
+        if subtotal is not None:
+            _set(new, "_subtotal", subtotal)
+        return new
+
+
+class OrderDraft:
+    """Mutable scratch copy of an ``Order`` (a transient, as in Clojure or Immer).
+
+    Updates are collected in plain Python containers that are copied from the
+    base order only when first touched; ``freeze`` then builds a single new
+    ``Order``. The base order is never modified, and freezing an untouched
+    draft returns the base order itself.
+    """
+
+    __slots__ = ("_base", "_paid", "_items", "_tags", "_meta")
+
+    def __init__(self, base: Order) -> None:
+        self._base = base
+        self._paid = base.paid
+        self._items: list[Item] = []
+        self._tags: Optional[set[str]] = None
+        self._meta: Optional[dict[str, str]] = None
+
+    def with_item(self, item: Item) -> "OrderDraft":
+        self._items.append(item)
+        return self
+
+    def add_item(self, sku: str, price: float, qty: int) -> "OrderDraft":
+        return self.with_item(Item(sku, price, qty))
+
+    def add_tag(self, tag: str) -> "OrderDraft":
+        if self._tags is None:
+            self._tags = set(self._base.tags)
+        self._tags.add(tag)
+        return self
+
+    def pay(self) -> "OrderDraft":
+        self._paid = True
+        return self
+
+    def with_meta(self, **patch: str) -> "OrderDraft":
+        if self._meta is None:
+            self._meta = dict(self._base.meta)
+        self._meta.update(patch)
+        return self
+
+    def freeze(self) -> Order:
+        base = self._base
+        items: Items = base.items
+        if self._items:
+            if isinstance(items, ItemVector):
+                items = items.extend(self._items)
+            else:
+                items = items + tuple(self._items)
+        tags = base.tags if self._tags is None else frozenset(self._tags)
+        meta = base.meta if self._meta is None else MappingProxyType(dict(self._meta))
+        if (
+            items is base.items
+            and self._paid == base.paid
+            and tags == base.tags
+            and self._meta is None
+        ):
+            return base
+        return base._derive(self._paid, items, tags, meta, _subtotal_of(items))
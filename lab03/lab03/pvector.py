@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Tuple, Union, overload
+
+if TYPE_CHECKING:
+    from .model import Item
+
+# 32-way trie with a tail buffer (the Clojure/pyrsistent persistent vector layout).
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+
+
+class _Node:
+    """Trie node: children are ``_Node``s (inner levels) or ``Item``s (leaves)."""
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: Tuple[Any, ...]) -> None:
+        self.children = children
+
+
+_EMPTY_NODE = _Node(())
+
+
+def items_total(items: Iterable[Item]) -> float:
+    """Sum of ``Item.total`` added left to right from 0.0.
+
+    This is the one summation order behind ``ItemVector.total`` and
+    ``Order.subtotal()``, whichever way the items were put together.
+    """
+    total = 0.0
+    for it in items:
+        total += it.price * it.qty
+    return total
+
+
+class ItemVector(Sequence["Item"]):
+    """Immutable, structurally shared sequence of ``Item`` with O(1) ``total``.
+
+    ``append`` returns a new vector in amortised O(1): items go to a tail of up
+    to 32 elements, and only a full tail is pushed into the trie, copying one
+    path of O(log32 n) nodes. The vector carries the running ``total`` of its
+    items, so reading it is O(1) and gives exactly ``items_total(vector)``. A
+    vector compares and hashes like the tuple of its items. There are no
+    in-place mutators: every update returns a new vector and nodes, once built,
+    are never modified.
+    """
+
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_total", "_hash")
+
+    _count: int
+    _shift: int
+    _root: _Node
+    _tail: Tuple[Item, ...]
+    _total: float
+    _hash: Optional[int]
+
+    def __new__(cls, items: Iterable[Item] = ()) -> ItemVector:
+        items = tuple(items)
+        n = len(items)
+        if not n:
+            return cls._make(0, _BITS, _EMPTY_NODE, (), 0.0)
+        tail_len = n - ((n - 1) >> _BITS << _BITS)
+        nodes = [
+            _Node(chunk)
+            for chunk in (items[i : i + _WIDTH] for i in range(0, n - tail_len, _WIDTH))
+        ]
+        shift = _BITS
+        while len(nodes) > _WIDTH:
+            nodes = [_Node(tuple(nodes[i : i + _WIDTH])) for i in range(0, len(nodes), _WIDTH)]
+            shift += _BITS
+        tail = items[n - tail_len :]
+        return cls._make(n, shift, _Node(tuple(nodes)), tail, items_total(items))
+
+    @classmethod
+    def _make(
+        cls, count: int, shift: int, root: _Node, tail: Tuple[Item, ...], total: float
+    ) -> ItemVector:
+        self = object.__new__(cls)
+        self._count = count
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+        self._total = total
+        self._hash = None
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (ItemVector, (tuple(self),))
+
+    # ---- reads ----
+
+    @property
+    def total(self) -> float:
+        """Sum of ``Item.total`` over all items, in ``items_total`` order."""
+        return self._total
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Item: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Tuple[Item, ...]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Item, Tuple[Item, ...]]:
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("ItemVector index out of range")
+        tail_offset = self._count - len(self._tail)
+        if index >= tail_offset:
+            return self._tail[index - tail_offset]
+        leaf: Item = self._leaf(index).children[index & _MASK]
+        return leaf
+
+    def _leaf(self, index: int) -> _Node:
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node.children[(index >> level) & _MASK]
+            level -= _BITS
+        return node
+
+    def __iter__(self) -> Iterator[Item]:
+        for base in range(0, self._count - len(self._tail), _WIDTH):
+            yield from self._leaf(base).children
+        yield from self._tail
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ItemVector, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __hash__(self) -> int:
+        h = self._hash
+        if h is None:
+            h = self._hash = hash(tuple(self))
+        return h
+
+    def __repr__(self) -> str:
+        return f"ItemVector({tuple(self)!r})"
+
+    # ---- persistent updates ----
+
+    def append(self, item: Item) -> ItemVector:
+        """Return a new vector with ``item`` at the end; ``self`` is unchanged."""
+        total = self._total + item.price * item.qty
+        if len(self._tail) < _WIDTH:
+            return self._make(self._count + 1, self._shift, self._root, self._tail + (item,), total)
+        leaf = _Node(self._tail)
+        shift = self._shift
+        if (self._count >> _BITS) > (1 << shift):
+            root = _Node((self._root, _new_path(shift, leaf)))
+            shift += _BITS
+        else:
+            root = _push_tail(self._count, shift, self._root, leaf)
+        return self._make(self._count + 1, shift, root, (item,), total)
+
+    def extend(self, items: Iterable[Item]) -> ItemVector:
+        vec = self
+        for item in items:
+            vec = vec.append(item)
+        return vec
+
+
+def _new_path(level: int, node: _Node) -> _Node:
+    while level > 0:
+        node = _Node((node,))
+        level -= _BITS
+    return node
+
+
+def _push_tail(count: int, level: int, parent: _Node, leaf: _Node) -> _Node:
+    """Copy the path to the rightmost slot under ``parent`` and hang ``leaf`` there."""
+    sub = ((count - 1) >> level) & _MASK
+    children = parent.children
+    if level == _BITS:
+        child = leaf
+    elif sub < len(children):
+        child = _push_tail(count, level - _BITS, children[sub], leaf)
+    else:
+        child = _new_path(level - _BITS, leaf)
+    return _Node(children[:sub] + (child,))
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from array import array
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from .model import Item, Order
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None  # type: ignore[assignment]
+
+_EMPTY_META: Mapping[str, str] = MappingProxyType({})
+
+
+class OrderTable:
+    """Column store for many immutable orders.
+
+    Per-order data lives in flat ``array`` columns (``ids``, ``paid``, tag
+    bitsets and ``offsets`` into the item columns); items are split into
+    ``sku``/``price``/``qty`` columns with SKUs and tag names interned. Equal
+    ``meta`` mappings are stored once. Rows are exposed as ``OrderView`` objects
+    created on demand, and ``subtotals`` works on whole columns at once.
+    """
+
+    __slots__ = (
+        "_ids",
+        "_paid",
+        "_offsets",
+        "_sku_ids",
+        "_prices",
+        "_qtys",
+        "_skus",
+        "_tag_names",
+        "_tag_words",
+        "_tag_bits",
+        "_meta_ids",
+        "_metas",
+        "_tag_sets",
+    )
+
+    def __init__(self, orders: Iterable[Order] = ()) -> None:
+        self._ids = array("q")
+        self._paid = array("b")
+        self._offsets = array("q", [0])
+        self._sku_ids = array("i")
+        self._prices = array("d")
+        self._qtys = array("q")
+        self._skus: List[str] = []
+        self._meta_ids = array("i")
+        self._metas: List[Mapping[str, str]] = []
+        self._tag_sets: Dict[Tuple[int, ...], frozenset[str]] = {}
+
+        sku_index: Dict[str, int] = {}
+        tag_index: Dict[str, int] = {}
+        meta_index: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        row_tags: List[List[int]] = []
+        for o in orders:
+            self._ids.append(o.id)
+            self._paid.append(o.paid)
+            for item in o.items:
+                sku = sku_index.get(item.sku)
+                if sku is None:
+                    sku = sku_index[item.sku] = len(self._skus)
+                    self._skus.append(item.sku)
+                self._sku_ids.append(sku)
+                self._prices.append(item.price)
+                self._qtys.append(item.qty)
+            self._offsets.append(len(self._prices))
+            row_tags.append([tag_index.setdefault(t, len(tag_index)) for t in o.tags])
+            key = tuple(o.meta.items())
+            meta = meta_index.get(key)
+            if meta is None:
+                meta = meta_index[key] = len(self._metas)
+                self._metas.append(MappingProxyType(dict(key)) if key else _EMPTY_META)
+            self._meta_ids.append(meta)
+
+        # tag sets become fixed-width bitsets once the vocabulary is known
+        self._tag_names = tuple(tag_index)
+        self._tag_words = words = max(1, -(-len(tag_index) // 64))
+        self._tag_bits = array("Q", bytes(8 * words * len(row_tags)))
+        for row, tags in enumerate(row_tags):
+            for t in tags:
+                self._tag_bits[row * words + (t >> 6)] |= 1 << (t & 63)
+
+    # ---- rows ----
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, row: int) -> OrderView:
+        if row < 0:
+            row += len(self._ids)
+        if not 0 <= row < len(self._ids):
+            raise IndexError("OrderTable row out of range")
+        return OrderView(self, row)
+
+    def __iter__(self) -> Iterator[OrderView]:
+        for row in range(len(self._ids)):
+            yield OrderView(self, row)
+
+    def to_orders(self) -> List[Order]:
+        return [view.to_order() for view in self]
+
+    # ---- read-only columns ----
+
+    @property
+    def ids(self) -> memoryview:
+        return memoryview(self._ids).toreadonly()
+
+    @property
+    def paid(self) -> memoryview:
+        return memoryview(self._paid).toreadonly()
+
+    @property
+    def offsets(self) -> memoryview:
+        return memoryview(self._offsets).toreadonly()
+
+    @property
+    def prices(self) -> memoryview:
+        return memoryview(self._prices).toreadonly()
+
+    @property
+    def qtys(self) -> memoryview:
+        return memoryview(self._qtys).toreadonly()
+
+    @property
+    def tag_names(self) -> Tuple[str, ...]:
+        return self._tag_names
+
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers (interned strings and metas not included)."""
+        columns = (self._ids, self._paid, self._offsets, self._meta_ids, self._tag_bits)
+        return sum(c.itemsize * len(c) for c in columns + (self._sku_ids, self._prices, self._qtys))
+
+    # ---- whole-table operations ----
+
+    def subtotals(self) -> array[float]:
+        """Subtotal of every order, summed in item order like ``Order.subtotal``."""
+        n = len(self._ids)
+        if np is not None and n:
+            prices = np.frombuffer(self._prices, dtype=np.float64)
+            qtys = np.frombuffer(self._qtys, dtype=np.int64)
+            bounds = np.frombuffer(self._offsets, dtype=np.int64)
+            rows = np.repeat(np.arange(n), bounds[1:] - bounds[:-1])
+            sums = np.bincount(rows, weights=prices * qtys, minlength=n)
+            return array("d", sums.tobytes())
+        out = array("d", bytes(8 * n))
+        prices_, qtys_, offsets = self._prices, self._qtys, self._offsets
+        for row in range(n):
+            total = 0.0
+            for i in range(offsets[row], offsets[row + 1]):
+                total += prices_[i] * qtys_[i]
+            out[row] = total
+        return out
+
+    def rows_with_tag(self, tag: str) -> List[int]:
+        """Row numbers of orders carrying ``tag``, via the tag bitsets."""
+        try:
+            t = self._tag_names.index(tag)
+        except ValueError:
+            return []
+        words, word, bit = self._tag_words, t >> 6, 1 << (t & 63)
+        bits = self._tag_bits
+        return [row for row in range(len(self._ids)) if bits[row * words + word] & bit]
+
+    # ---- row access used by OrderView ----
+
+    def _items(self, row: int) -> Tuple[Item, ...]:
+        lo, hi = self._offsets[row], self._offsets[row + 1]
+        skus, prices, qtys = self._skus, self._prices, self._qtys
+        return tuple(Item(skus[self._sku_ids[i]], prices[i], qtys[i]) for i in range(lo, hi))
+
+    def _tags(self, row: int) -> frozenset[str]:
+        words = self._tag_words
+        key = tuple(self._tag_bits[row * words : (row + 1) * words])
+        tags = self._tag_sets.get(key)
+        if tags is None:
+            names = self._tag_names
+            tags = frozenset(
+                names[w * 64 + b] for w, word in enumerate(key) for b in range(64) if word >> b & 1
+            )
+            self._tag_sets[key] = tags
+        return tags
+
+
+class OrderView:
+    """Read-only row of an ``OrderTable`` with the reading API of ``Order``."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: OrderTable, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._table._ids[self._row]
+
+    @property
+    def paid(self) -> bool:
+        return bool(self._table._paid[self._row])
+
+    @property
+    def items(self) -> Tuple[Item, ...]:
+        return self._table._items(self._row)
+
+    @property
+    def tags(self) -> frozenset[str]:
+        return self._table._tags(self._row)
+
+    @property
+    def meta(self) -> Mapping[str, str]:
+        t = self._table
+        return t._metas[t._meta_ids[self._row]]
+
+    def subtotal(self) -> float:
+        t, row = self._table, self._row
+        total = 0.0
+        for i in range(t._offsets[row], t._offsets[row + 1]):
+            total += t._prices[i] * t._qtys[i]
+        return total
+
+    def to_order(self) -> Order:
+        return Order(self.id, self.paid, self.items, self.tags, self.meta)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (OrderView, Order)):
+            return (self.id, self.paid, self.items, self.tags) == (
+                other.id,
+                other.paid,
+                other.items,
+                other.tags,
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.to_order())
+
+    def __repr__(self) -> str:
+        return f"OrderView(row={self._row}, id={self.id}, paid={self.paid})"
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import random
 from copy import deepcopy
-from typing import Any, cast
+from dataclasses import fields, replace
+from typing import Any, Dict, List, cast
 
 import pytest
 
-from lab03.core import add_item, freeze, top_expensive_items
-from lab03.model import Item, Order, make_meta
+from lab03.core import add_item, evolve, freeze, top_expensive_items
+from lab03.model import Item, Order, OrderDraft, make_meta
 
 
 def make_sample_order() -> Order:
@@ -60,3 +62,96 @@ def test_freeze_deep() -> None:
     f = freeze(deep)
     with pytest.raises(TypeError):
         cast(Any, f["b"])["x"] = 2  # inner mapping is read-only
+
+
+def test_subtotal_is_cached_and_carried_forward() -> None:
+    o1 = make_sample_order()
+    assert o1.subtotal() == 120.0
+    o2 = add_item(o1, "C3", 15.0, 2).add_tag("x").pay().with_meta(source="web")
+    assert o2.subtotal() == 150.0
+    assert o2 == Order(o2.id, True, o2.items, o2.tags, make_meta()) and o2.paid
+    assert "_subtotal" not in repr(o2)
+    # frozen + slots dataclasses reject non-field names with TypeError on CPython
+    with pytest.raises((AttributeError, TypeError)):
+        cast(Any, o2)._subtotal = 0.0
+    assert deepcopy(o2).subtotal() == 150.0
+
+
+def test_subtotal_is_not_a_dataclass_field() -> None:
+    o1 = make_sample_order()
+    assert [f.name for f in fields(o1)] == ["id", "paid", "items", "tags", "meta"]
+    o2 = replace(o1.with_item(Item("C3", 15.0, 2)), items=o1.items)
+    assert o2.subtotal() == o1.subtotal() == 120.0  # recomputed for the replaced items
+
+
+def test_evolve_matches_chained_updates() -> None:
+    o1 = make_sample_order()
+    chained = add_item(add_item(o1, "C3", 15.0, 2), "D4", 1.5, 4).add_tag("vip").pay()
+    chained = chained.with_meta(source="web", step="2")
+
+    def recipe(d: OrderDraft) -> None:
+        d.add_item("C3", 15.0, 2).add_item("D4", 1.5, 4).add_tag("vip").pay()
+        d.with_meta(source="web").with_meta(step="2")
+
+    evolved = evolve(o1, recipe)
+    assert evolved == chained
+    assert evolved.subtotal() == chained.subtotal()
+    assert dict(evolved.meta) == dict(chained.meta)
+    assert isinstance(evolved.items, tuple)
+    # the base order is untouched and an empty recipe returns it as is
+    assert o1 == make_sample_order() and dict(o1.meta)["source"] == "fb_ads"
+    assert evolve(o1, lambda d: None) is o1
+
+
+def test_freeze_deep_nesting_without_recursion() -> None:
+    deep: Any = {"leaf": [1, 2]}
+    for i in range(50_000):
+        deep = {"child": deep, "n": [i]}
+    f = freeze(deep)
+    for _ in range(50_000):
+        f = f["child"]
+    assert f["leaf"] == (1, 2)
+
+
+def test_freeze_memo_sharing_cycles_and_reuse() -> None:
+    shared = {"x": [1, {2, 3}]}
+    data: Any = {"a": shared, "b": [shared, shared], "t": (1, "s")}
+    data["self"] = data
+    f = freeze(data)
+    assert f["a"] is f["b"][0] is f["b"][1]
+    assert f["self"] is f
+    assert f["a"]["x"] == (1, frozenset({2, 3}))
+    assert f["t"] is data["t"]  # already immutable: not copied
+    assert freeze(f) is f
+
+    loop: List[Any] = [1]
+    loop.append(loop)
+    with pytest.raises(ValueError):
+        freeze(loop)
+
+
+def test_freeze_intern_shares_equal_values() -> None:
+    configs = [{"retry": [1, 2, 3], "flags": {"a", "b"}, "n": 1} for _ in range(3)]
+    pool: Dict[Any, Any] = {}
+    a, b, c = (freeze(cfg, pool=pool) for cfg in configs)
+    assert a is b is c
+    assert freeze({"retry": [1, 2, 3], "flags": {"a", "b"}, "n": 1}, pool=pool) is a
+    # equal but differently typed atoms are not merged
+    assert freeze([[1], [1.0], [True]], intern=True) == ((1,), (1.0,), (True,))
+    ints, floats, bools = freeze([[1], [1.0], [True]], intern=True)
+    assert (type(ints[0]), type(floats[0]), type(bools[0])) == (int, float, bool)
+    cyclic: Dict[str, Any] = {}
+    cyclic["me"] = cyclic
+    with pytest.raises(ValueError):
+        freeze(cyclic, intern=True)
+
+
+@pytest.mark.parametrize("m", [0, 5, 100, 5000])
+@pytest.mark.parametrize("n", [-2, 0, 1, 3, 50, 6000])
+def test_top_expensive_items_matches_stable_sort(m: int, n: int) -> None:
+    rnd = random.Random(m * 31 + n)
+    # few distinct totals, so ties are everywhere
+    items = [Item(f"S{i}", float(rnd.randint(1, 6)), rnd.randint(1, 3)) for i in range(m)]
+    expected = tuple(sorted(items, key=lambda i: i.total, reverse=True)[:n])
+    assert top_expensive_items(items, n) == expected
+    assert top_expensive_items(tuple(items), n) == expected
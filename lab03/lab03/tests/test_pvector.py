@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import pickle
+import random
+from copy import deepcopy
+from typing import List
+
+import pytest
+
+from lab03.core import add_item, evolve
+from lab03.model import Item, Order, make_meta
+from lab03.pvector import ItemVector, items_total
+
+
+def make_items(n: int) -> List[Item]:
+    return [Item(f"S{i}", float(i % 7) + 0.5, i % 3 + 1) for i in range(n)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 31, 32, 33, 64, 1056, 1057, 2000, 33_000])
+def test_append_and_bulk_build_match_tuple(n: int) -> None:
+    items = make_items(n)
+    appended = ItemVector()
+    for it in items:
+        appended = appended.append(it)
+    bulk = ItemVector(items)
+
+    for vec in (appended, bulk):
+        assert len(vec) == n
+        assert list(vec) == items
+        assert vec == tuple(items) and tuple(items) == vec
+        assert hash(vec) == hash(tuple(items))
+        assert vec.total == items_total(items)
+        for i in {0, n // 2, n - 1} if n else ():
+            assert vec[i] == items[i]
+            assert vec[i - n] == items[i]
+    assert appended == bulk
+    with pytest.raises(IndexError):
+        bulk[n]
+
+
+def test_append_shares_structure_and_keeps_old_versions() -> None:
+    base = ItemVector(make_items(100))
+    a = base.append(Item("A", 1.0, 1))
+    b = base.append(Item("B", 2.0, 1))
+    assert len(base) == 100 and base[-1] == make_items(100)[-1]
+    assert (a[-1].sku, b[-1].sku) == ("A", "B")
+    assert a != b and a[:100] == b[:100] == tuple(base)
+
+
+def test_vector_is_picklable() -> None:
+    vec = ItemVector(make_items(40))
+    assert pickle.loads(pickle.dumps(vec)) == vec
+    assert deepcopy(vec) == vec
+
+
+def test_order_with_item_keeps_eq_and_hash_semantics() -> None:
+    meta = make_meta(source="test")
+    built = Order(id=1, paid=False, items=(), tags=frozenset(), meta=meta)
+    for it in make_items(500):
+        built = add_item(built, it.sku, it.price, it.qty)
+    plain = Order(id=1, paid=False, items=tuple(make_items(500)), tags=frozenset(), meta=meta)
+
+    assert isinstance(built.items, ItemVector)
+    assert built == plain and hash(built) == hash(plain)
+    assert built.subtotal() == plain.subtotal()
+    assert len({built, plain}) == 1
+
+
+def test_subtotal_does_not_depend_on_how_items_were_built() -> None:
+    rnd = random.Random(5)
+    items = [Item(f"S{i}", rnd.uniform(0.01, 999.99), rnd.randint(1, 9)) for i in range(2000)]
+    meta = make_meta()
+    appended = Order(id=1, paid=False, items=(), tags=frozenset(), meta=meta)
+    for it in items:
+        appended = appended.with_item(it)
+    head = Order(id=1, paid=False, items=tuple(items[:700]), tags=frozenset(), meta=meta)
+    orders = [
+        appended,
+        evolve(head, lambda d: [d.with_item(it) for it in items[700:]]),
+        evolve(head.with_item(items[700]), lambda d: [d.with_item(it) for it in items[701:]]),
+        Order(id=1, paid=False, items=tuple(items), tags=frozenset(), meta=meta),
+        Order(id=1, paid=False, items=ItemVector(items), tags=frozenset(), meta=meta),
+    ]
+    assert all(o == orders[0] for o in orders)
+    assert {o.subtotal() for o in orders} == {items_total(items)}
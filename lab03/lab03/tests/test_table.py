@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import random
+from typing import Any, List, cast
+
+import pytest
+
+from lab03 import table as table_module
+from lab03.model import Item, Order, make_meta
+from lab03.table import OrderTable
+
+
+def make_orders(n: int, seed: int = 0) -> List[Order]:
+    rnd = random.Random(seed)
+    tag_pool = [f"t{i}" for i in range(70)]  # more than one 64-bit word of tags
+    return [
+        Order(
+            id=i,
+            paid=rnd.random() < 0.5,
+            items=tuple(
+                Item(f"SKU{rnd.randint(0, 20)}", round(rnd.uniform(1, 100), 2), rnd.randint(1, 5))
+                for _ in range(rnd.randint(0, 6))
+            ),
+            tags=frozenset(rnd.sample(tag_pool, rnd.randint(0, 3))),
+            meta=make_meta(src=rnd.choice(["web", "app"])) if i % 3 else make_meta(),
+        )
+        for i in range(n)
+    ]
+
+
+def test_views_round_trip_orders() -> None:
+    orders = make_orders(300)
+    table = OrderTable(orders)
+    assert len(table) == 300
+    assert table.to_orders() == orders
+    for o, view in zip(orders, table):
+        assert view == o and hash(view) == hash(o)
+        assert (view.id, view.paid, view.items, view.tags) == (o.id, o.paid, o.items, o.tags)
+        assert dict(view.meta) == dict(o.meta)
+        assert view.subtotal() == pytest.approx(o.subtotal())
+    assert table[-1] == orders[-1]
+    with pytest.raises(IndexError):
+        table[300]
+
+
+def test_columns_are_read_only_and_metas_shared() -> None:
+    table = OrderTable(make_orders(50))
+    with pytest.raises(TypeError):
+        cast(Any, table.ids)[0] = 99
+    assert len({id(view.meta) for view in table}) <= 3  # {}, {"src": "web"}, {"src": "app"}
+    assert table.nbytes() < 50 * 200
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_subtotals_and_tag_lookup(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not use_numpy:
+        monkeypatch.setattr(table_module, "np", None)
+    orders = make_orders(500, seed=1)
+    table = OrderTable(orders)
+    assert list(table.subtotals()) == pytest.approx([o.subtotal() for o in orders])
+    assert table.rows_with_tag("t65") == [i for i, o in enumerate(orders) if "t65" in o.tags]
+    assert table.rows_with_tag("missing") == []
+    assert list(OrderTable().subtotals()) == []
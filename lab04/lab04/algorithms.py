@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from collections import deque
 from dataclasses import dataclass
-from functools import lru_cache
 from random import choice
-from typing import Generator, List, Optional
+from typing import Generator, Iterator, List, MutableSequence, Optional, Tuple
+
+from .memo import memoize
 
 
 # ------------------- Quicksort (recursive, pure) -------------------
@@ -29,33 +30,100 @@ class Node:
 
 
 def preorder(t: Optional[Node]) -> Generator[int, None, None]:
+    """Keys in pre-order, produced lazily from an explicit stack (no recursion limit)."""
     if t is None:
         return
-    yield t.key
-    if t.left is not None:
-        yield from preorder(t.left)
-    if t.right is not None:
-        yield from preorder(t.right)
+    stack = [t]
+    while stack:
+        n = stack.pop()
+        yield n.key
+        if n.right is not None:
+            stack.append(n.right)
+        if n.left is not None:
+            stack.append(n.left)
 
 
 def inorder(t: Optional[Node]) -> Generator[int, None, None]:
-    if t is None:
-        return
-    if t.left is not None:
-        yield from inorder(t.left)
-    yield t.key
-    if t.right is not None:
-        yield from inorder(t.right)
+    """Keys in in-order; the stack holds the left spine, so extra memory is O(depth)."""
+    stack: List[Node] = []
+    n = t
+    while True:
+        while n is not None:
+            stack.append(n)
+            n = n.left
+        if not stack:
+            return
+        n = stack.pop()
+        yield n.key
+        n = n.right
 
 
 def postorder(t: Optional[Node]) -> Generator[int, None, None]:
+    """Keys in post-order; a node is emitted once its right subtree was the last one left."""
+    stack: List[Node] = []
+    n, last = t, None
+    while stack or n is not None:
+        if n is not None:
+            stack.append(n)
+            n = n.left
+            continue
+        top = stack[-1]
+        if top.right is not None and top.right is not last:
+            n = top.right
+        else:
+            yield top.key
+            last = stack.pop()
+
+
+def traverse(
+    t: Optional[Node], order: str = "in", out: Optional[MutableSequence[int]] = None
+) -> MutableSequence[int]:
+    """Append all keys in ``order`` ("pre", "in" or "post") to ``out`` in one tight loop.
+
+    Batched counterpart of the generators above: no per-key generator resume.
+    ``out`` defaults to a new list; an ``array('q')`` works as well.
+    Post-order is collected as root-right-left and the appended tail is reversed.
+    """
+    if out is None:
+        out = []
+    append = out.append
+    if order == "in":
+        stack: List[Node] = []
+        n = t
+        while True:
+            while n is not None:
+                stack.append(n)
+                n = n.left
+            if not stack:
+                return out
+            n = stack.pop()
+            append(n.key)
+            n = n.right
+    if order not in ("pre", "post"):
+        raise ValueError(f"unknown order {order!r}; expected 'pre', 'in' or 'post'")
     if t is None:
-        return
-    if t.left is not None:
-        yield from postorder(t.left)
-    if t.right is not None:
-        yield from postorder(t.right)
-    yield t.key
+        return out
+    start = len(out)
+    stack = [t]
+    push, pop = stack.append, stack.pop
+    if order == "pre":
+        while stack:
+            n = pop()
+            append(n.key)
+            if n.right is not None:
+                push(n.right)
+            if n.left is not None:
+                push(n.left)
+        return out
+    while stack:
+        n = pop()
+        append(n.key)
+        if n.left is not None:
+            push(n.left)
+        if n.right is not None:
+            push(n.right)
+    out[start:] = out[start:][::-1]
+    return out
 
 
 # Iterative alternatives
@@ -88,7 +156,16 @@ def dfs_preorder_iter(t: Optional[Node]) -> List[int]:
 
 
 # ------------------- Memoized Fibonacci -------------------
-@lru_cache(maxsize=None)
+# A cold fib(n) first fills the cache at 0, 64, 128, ... < n, so no call recurses
+# more than 64 levels below the last cached value.
+_FIB_STEP = 64
+
+
+def _fib_ladder(n: int) -> Iterator[Tuple[int]]:
+    return ((k,) for k in range(0, n, _FIB_STEP))
+
+
+@memoize(maxsize=1024, bottom_up=_fib_ladder)
 def fib(n: int) -> int:
     if n < 0:
         raise ValueError("n must be non-negative")
@@ -104,3 +181,43 @@ def fib_iter(n: int) -> int:
     for _ in range(n):
         a, b = b, a + b
     return a
+
+
+# ------------------- Fast doubling Fibonacci -------------------
+def fib_pair(n: int) -> Tuple[int, int]:
+    """``(F(n), F(n + 1))`` by fast doubling: O(log n) big-integer multiplications.
+
+    Walks the bits of ``n`` from the top, keeping ``(F(k), F(k+1))`` and using
+    ``F(2k) = F(k) * (2F(k+1) - F(k))`` and ``F(2k+1) = F(k)^2 + F(k+1)^2``.
+    Iterative, so there is no recursion limit and no cache to keep alive.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+
+def fib_fast(n: int) -> int:
+    """``F(n)`` in O(log n) multiplications; the last doubling step builds only ``F(n)``."""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    a, b = fib_pair(n >> 1)
+    return a * a + b * b if n & 1 else a * (2 * b - a)
+
+
+def fib_mod(n: int, mod: int) -> int:
+    """``F(n) % mod`` by fast doubling; every intermediate stays below ``mod**2``."""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if mod < 1:
+        raise ValueError("mod must be positive")
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % mod
+        d = (a * a + b * b) % mod
+        a, b = (d, (c + d) % mod) if bit == "1" else (c, d)
+    return a % mod
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Generator, List, Optional
+
+from .algorithms import Node
+
+# Child index meaning "no child".
+NIL = -1
+
+
+class ArrayTree:
+    """Binary tree flattened into three parallel ``array('q')`` columns.
+
+    Node ``i`` has key ``keys[i]`` and children ``left[i]`` / ``right[i]``
+    (``NIL`` when absent). Nodes are numbered in pre-order, so the root is 0,
+    every left child directly follows its parent and a pre-order walk is a
+    plain scan of ``keys``. A million nodes take 24 MB of columns instead of a
+    million ``Node`` objects, and traversals chase small integers instead of
+    object pointers. All walks use explicit stacks, so depth is not limited.
+    """
+
+    __slots__ = ("_keys", "_left", "_right")
+
+    def __init__(self, t: Optional[Node] = None) -> None:
+        self._keys = keys = array("q")
+        self._left = left = array("q")
+        self._right = right = array("q")
+        if t is None:
+            return
+        # (node, parent index, child column of the parent to patch)
+        stack = [(t, NIL, left)]
+        while stack:
+            n, parent, side = stack.pop()
+            i = len(keys)
+            keys.append(n.key)
+            left.append(NIL)
+            right.append(NIL)
+            if parent != NIL:
+                side[parent] = i
+            if n.right is not None:
+                stack.append((n.right, i, right))
+            if n.left is not None:
+                stack.append((n.left, i, left))
+
+    def to_node(self) -> Optional[Node]:
+        """Rebuild the linked ``Node`` tree (iteratively, so any depth works)."""
+        if not self._keys:
+            return None
+        nodes = [Node(k) for k in self._keys]
+        for n, lo, hi in zip(nodes, self._left, self._right):
+            if lo != NIL:
+                n.left = nodes[lo]
+            if hi != NIL:
+                n.right = nodes[hi]
+        return nodes[0]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ---- read-only columns ----
+
+    @property
+    def keys(self) -> memoryview:
+        return memoryview(self._keys).toreadonly()
+
+    @property
+    def left(self) -> memoryview:
+        return memoryview(self._left).toreadonly()
+
+    @property
+    def right(self) -> memoryview:
+        return memoryview(self._right).toreadonly()
+
+    def nbytes(self) -> int:
+        """Bytes held by the three columns."""
+        return sum(c.itemsize * len(c) for c in (self._keys, self._left, self._right))
+
+    # ---- traversals over indices ----
+
+    def preorder(self) -> Generator[int, None, None]:
+        yield from self._keys
+
+    def inorder(self) -> Generator[int, None, None]:
+        keys, left, right = self._keys, self._left, self._right
+        stack: List[int] = []
+        i = 0 if keys else NIL
+        while True:
+            while i != NIL:
+                stack.append(i)
+                i = left[i]
+            if not stack:
+                return
+            i = stack.pop()
+            yield keys[i]
+            i = right[i]
+
+    def postorder(self) -> Generator[int, None, None]:
+        keys, left, right = self._keys, self._left, self._right
+        stack: List[int] = []
+        i, last = (0 if keys else NIL), NIL
+        while stack or i != NIL:
+            if i != NIL:
+                stack.append(i)
+                i = left[i]
+                continue
+            top = stack[-1]
+            if right[top] != NIL and right[top] != last:
+                i = right[top]
+            else:
+                yield keys[top]
+                last = stack.pop()
+
+    def traverse(self, order: str = "in") -> List[int]:
+        """All keys in ``order`` ("pre", "in" or "post") as one list, without a generator."""
+        if order == "pre":
+            return self._keys.tolist()
+        keys, left, right = self._keys, self._left, self._right
+        out: List[int] = []
+        append = out.append
+        if order == "in":
+            spine: List[int] = []
+            i = 0 if keys else NIL
+            while True:
+                while i != NIL:
+                    spine.append(i)
+                    i = left[i]
+                if not spine:
+                    return out
+                i = spine.pop()
+                append(keys[i])
+                i = right[i]
+        if order != "post":
+            raise ValueError(f"unknown order {order!r}; expected 'pre', 'in' or 'post'")
+        # root-right-left, reversed
+        stack = [0] if keys else []
+        push, pop = stack.append, stack.pop
+        while stack:
+            i = pop()
+            append(keys[i])
+            if left[i] != NIL:
+                push(left[i])
+            if right[i] != NIL:
+                push(right[i])
+        out.reverse()
+        return out
+
+    def bfs_level_order(self) -> List[int]:
+        keys, left, right = self._keys, self._left, self._right
+        if not keys:
+            return []
+        q, out = deque([0]), []
+        while q:
+            i = q.popleft()
+            out.append(keys[i])
+            if left[i] != NIL:
+                q.append(left[i])
+            if right[i] != NIL:
+                q.append(right[i])
+        return out
+
+    def dfs_preorder_iter(self) -> List[int]:
+        # the pre-order numbering makes this a copy of the key column
+        return self._keys.tolist()
+
+    def __repr__(self) -> str:
+        return f"ArrayTree(nodes={len(self._keys)})"
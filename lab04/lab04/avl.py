@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Generator, Iterable, List, Optional, Sequence, Tuple, cast
+
+from .algorithms import Node
+
+
+# ------------------- AVL tree on the Node layout -------------------
+@dataclass(slots=True)
+class AVLNode(Node):
+    """``Node`` plus the height of its subtree (a leaf has height 1)."""
+
+    height: int = 1
+
+
+def _height(n: Optional[Node]) -> int:
+    return 0 if n is None else cast(AVLNode, n).height
+
+
+def _update(n: AVLNode) -> None:
+    hl, hr = _height(n.left), _height(n.right)
+    n.height = (hl if hl > hr else hr) + 1
+
+
+def _rotate_right(n: AVLNode) -> AVLNode:
+    top = cast(AVLNode, n.left)
+    n.left, top.right = top.right, n
+    _update(n)
+    _update(top)
+    return top
+
+
+def _rotate_left(n: AVLNode) -> AVLNode:
+    top = cast(AVLNode, n.right)
+    n.right, top.left = top.left, n
+    _update(n)
+    _update(top)
+    return top
+
+
+def _rebalance(n: AVLNode) -> AVLNode:
+    """Restore ``|h(left) - h(right)| <= 1`` at ``n`` with at most two rotations."""
+    hl, hr = _height(n.left), _height(n.right)
+    if hl > hr + 1:
+        child = cast(AVLNode, n.left)
+        if _height(child.left) < _height(child.right):
+            n.left = _rotate_left(child)
+        return _rotate_right(n)
+    if hr > hl + 1:
+        child = cast(AVLNode, n.right)
+        if _height(child.right) < _height(child.left):
+            n.right = _rotate_right(child)
+        return _rotate_left(n)
+    n.height = (hl if hl > hr else hr) + 1
+    return n
+
+
+def _insert(n: Optional[Node], key: int) -> Tuple[AVLNode, bool]:
+    if n is None:
+        return AVLNode(key), True
+    node = cast(AVLNode, n)
+    if key < node.key:
+        node.left, added = _insert(node.left, key)
+    elif key > node.key:
+        node.right, added = _insert(node.right, key)
+    else:
+        return node, False
+    return (_rebalance(node), True) if added else (node, False)
+
+
+def _delete(n: Optional[Node], key: int) -> Tuple[Optional[AVLNode], bool]:
+    if n is None:
+        return None, False
+    node = cast(AVLNode, n)
+    if key < node.key:
+        node.left, removed = _delete(node.left, key)
+    elif key > node.key:
+        node.right, removed = _delete(node.right, key)
+    else:
+        if node.left is None or node.right is None:
+            return cast(Optional[AVLNode], node.left or node.right), True
+        succ = node.right
+        while succ.left is not None:
+            succ = succ.left
+        node.key = succ.key
+        node.right, removed = _delete(node.right, succ.key)
+    return (_rebalance(node), True) if removed else (node, False)
+
+
+def _build(keys: Sequence[int], lo: int, hi: int) -> Optional[AVLNode]:
+    """Perfectly balanced subtree over ``keys[lo:hi]``; recursion depth is log2(n)."""
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    left, right = _build(keys, lo, mid), _build(keys, mid + 1, hi)
+    hl, hr = _height(left), _height(right)
+    return AVLNode(keys[mid], left, right, (hl if hl > hr else hr) + 1)
+
+
+class AVLTree:
+    """Set of integer keys kept in a height-balanced BST made of ``AVLNode``.
+
+    ``insert``, ``delete`` and ``search`` are O(log n); ``range_iter`` walks
+    keys in ``[lo, hi)`` lazily in O(log n + k). ``bulk_load`` builds the tree
+    from sorted keys in O(n). ``root`` is an ordinary ``Node`` tree, so the
+    traversals in ``algorithms`` (``inorder(tree.root)`` etc.) work on it.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, keys: Iterable[int] = ()) -> None:
+        self._root: Optional[AVLNode] = None
+        self._size = 0
+        for key in keys:
+            self.insert(key)
+
+    @classmethod
+    def bulk_load(cls, keys: Iterable[int]) -> AVLTree:
+        """Build from keys in non-decreasing order (e.g. ``quicksort`` output) in O(n).
+
+        Duplicates are kept once; unsorted input raises ``ValueError``.
+        """
+        uniq: List[int] = []
+        for key in keys:
+            if uniq and key <= uniq[-1]:
+                if key == uniq[-1]:
+                    continue
+                raise ValueError("bulk_load needs keys in non-decreasing order")
+            uniq.append(key)
+        tree = cls()
+        tree._root = _build(uniq, 0, len(uniq))
+        tree._size = len(uniq)
+        return tree
+
+    @property
+    def root(self) -> Optional[AVLNode]:
+        return self._root
+
+    @property
+    def height(self) -> int:
+        return _height(self._root)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, key: int) -> bool:
+        """Add ``key``; returns ``False`` if it was already present."""
+        self._root, added = _insert(self._root, key)
+        self._size += added
+        return added
+
+    def delete(self, key: int) -> bool:
+        """Remove ``key``; returns ``False`` if it was not present."""
+        self._root, removed = _delete(self._root, key)
+        self._size -= removed
+        return removed
+
+    def search(self, key: int) -> Optional[AVLNode]:
+        n: Optional[Node] = self._root
+        while n is not None:
+            if key < n.key:
+                n = n.left
+            elif key > n.key:
+                n = n.right
+            else:
+                return cast(AVLNode, n)
+        return None
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, int) and self.search(key) is not None
+
+    def range_iter(
+        self, lo: Optional[int] = None, hi: Optional[int] = None
+    ) -> Generator[int, None, None]:
+        """Keys ``k`` with ``lo <= k < hi`` in order, produced lazily (``None`` = unbounded)."""
+        stack: List[Node] = []
+        n: Optional[Node] = self._root
+        # keep only the path of nodes >= lo; smaller ones are skipped with their left subtree
+        while n is not None:
+            if lo is not None and n.key < lo:
+                n = n.right
+            else:
+                stack.append(n)
+                n = n.left
+        while stack:
+            n = stack.pop()
+            if hi is not None and n.key >= hi:
+                return
+            yield n.key
+            n = n.right
+            while n is not None:
+                stack.append(n)
+                n = n.left
+
+    def __iter__(self) -> Generator[int, None, None]:
+        return self.range_iter()
+
+    def __repr__(self) -> str:
+        return f"AVLTree(size={self._size}, height={self.height})"
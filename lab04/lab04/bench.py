@@ -0,0 +1,240 @@
+"""Microbenchmarks for lab 4 algorithms.
+
+Run: ``python -m lab04.bench [--n N] [--repeat R]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+from functools import lru_cache
+from typing import Callable, Dict, Generator, List, Optional
+
+from .algorithms import (
+    Node,
+    bfs_level_order,
+    fib,
+    fib_fast,
+    fib_iter,
+    fib_mod,
+    inorder,
+    postorder,
+    preorder,
+    quicksort,
+    traverse,
+)
+from .arraytree import ArrayTree
+from .avl import AVLTree
+from .memo import memoize
+from .parallel import parallel_sort
+from .sorting import introsort
+
+
+def report(label: str, fn: Callable[[], object], repeat: int, n: int) -> float:
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    print(f"  {label:<28} {best * 1e3:10.2f} ms  {best / n * 1e9:8.1f} ns/elem")
+    return best
+
+
+def sort_inputs(n: int) -> Dict[str, List[int]]:
+    rnd = random.Random(0)
+    return {
+        "random": [rnd.randint(0, 10**9) for _ in range(n)],
+        "few distinct": [rnd.randint(0, 9) for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "organ pipe": [min(i, n - i) for i in range(n)],
+    }
+
+
+def bench_sort(n: int, repeat: int) -> None:
+    for name, xs in sort_inputs(n).items():
+        print(f"sort, {name} ({n} ints)")
+        assert introsort(xs) == sorted(xs)
+        report("sorted (C timsort)", lambda: sorted(xs), repeat, n)
+        report("quicksort (3 lists/level)", lambda: quicksort(xs), repeat, n)
+        report("introsort", lambda: introsort(xs), repeat, n)
+        report("introsort(key=...)", lambda: introsort(xs, key=abs), repeat, n)
+
+
+def bench_parallel(n: int, repeat: int) -> None:
+    rnd = random.Random(1)
+    xs = [rnd.randint(-(2**62), 2**62) for _ in range(n)]
+    print(f"parallel sort, random int64 ({n} ints, {os.cpu_count()} CPUs)")
+    expected = sorted(xs)
+    base = report("sorted (C timsort)", lambda: sorted(xs), repeat, n)
+    for workers in (1, 2, 4, 8):
+        assert list(parallel_sort(xs, workers)) == expected
+        best = report(
+            f"parallel_sort({workers} workers)", lambda: parallel_sort(xs, workers), repeat, n
+        )
+        print(f"    speedup vs sorted: x{base / best:.2f}")
+
+
+def recursive_inorder(t: Optional[Node]) -> Generator[int, None, None]:
+    """The original ``yield from`` version: every key climbs O(depth) generator frames."""
+    if t is None:
+        return
+    yield from recursive_inorder(t.left)
+    yield t.key
+    yield from recursive_inorder(t.right)
+
+
+def balanced_tree(lo: int, hi: int) -> Optional[Node]:
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    return Node(mid, balanced_tree(lo, mid), balanced_tree(mid + 1, hi))
+
+
+def degenerate_tree(n: int) -> Optional[Node]:
+    t: Optional[Node] = None
+    for key in range(n):
+        t = Node(key, left=t)
+    return t
+
+
+def bench_traversal(n: int, repeat: int) -> None:
+    shapes = {"balanced": balanced_tree(0, n), "degenerate": degenerate_tree(n)}
+    for name, t in shapes.items():
+        print(f"tree traversal, {name} ({n} nodes)")
+        if name == "balanced":
+            report("recursive inorder (old)", lambda: list(recursive_inorder(t)), repeat, n)
+        else:
+            print("  recursive inorder (old)      RecursionError at this depth")
+        report("inorder generator", lambda: list(inorder(t)), repeat, n)
+        report("preorder generator", lambda: list(preorder(t)), repeat, n)
+        report("postorder generator", lambda: list(postorder(t)), repeat, n)
+        for order in ("pre", "in", "post"):
+            report(f"traverse(order={order!r})", lambda: traverse(t, order), repeat, n)
+
+
+def allocated(build: Callable[[], object]) -> int:
+    """Bytes still allocated after ``build()`` returns (object kept alive while measuring)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+        del keep
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def bench_arraytree(n: int, repeat: int) -> None:
+    print(f"ArrayTree vs Node objects, balanced ({n} nodes)")
+    linked = allocated(lambda: balanced_tree(0, n))
+    t = balanced_tree(0, n)
+    flat = allocated(lambda: ArrayTree(t))
+    print(f"  memory: Node {linked / n:.0f} B/node, ArrayTree {flat / n:.0f} B/node")
+    at = ArrayTree(t)
+    assert at.traverse("in") == traverse(t, "in")
+    for order in ("pre", "in", "post"):
+        base = report(f"traverse(Node, {order!r})", lambda: traverse(t, order), repeat, n)
+        best = report(f"ArrayTree.traverse({order!r})", lambda: at.traverse(order), repeat, n)
+        print(f"    speedup: x{base / best:.2f}")
+    report("bfs_level_order(Node)", lambda: bfs_level_order(t), repeat, n)
+    report("ArrayTree.bfs_level_order", at.bfs_level_order, repeat, n)
+    report("ArrayTree(node) build", lambda: ArrayTree(t), repeat, n)
+    report("ArrayTree.to_node", at.to_node, repeat, n)
+
+
+def bench_avl(n: int, repeat: int) -> None:
+    keys = list(range(0, 2 * n, 2))
+    print(f"AVLTree ({n} keys)")
+    base = report("n x insert", lambda: AVLTree(keys), repeat, n)
+    best = report("bulk_load (sorted input)", lambda: AVLTree.bulk_load(keys), repeat, n)
+    print(f"    speedup: x{base / best:.2f}")
+    tree = AVLTree.bulk_load(keys)
+    probes = random.Random(2).sample(range(2 * n), 100_000)
+
+    def lookups() -> int:
+        return sum(1 for k in probes if tree.search(k) is not None)
+
+    report("search (100k probes)", lookups, repeat, len(probes))
+    report("range_iter, 1000 keys", lambda: list(tree.range_iter(n, n + 2000)), repeat, 1000)
+
+
+def bench_fib(max_n: int, repeat: int) -> None:
+    print("Fibonacci: fib_iter (n additions) vs fib_fast (fast doubling), time per call")
+    exp = 4
+    while 10**exp <= max_n:
+        n = 10**exp
+        if n <= 100_000:  # fib_iter(10^6) already takes ~15 s
+            assert fib_iter(n) == fib_fast(n)
+            report(f"fib_iter(10^{exp})", lambda: fib_iter(n), repeat, 1)
+        report(f"fib_fast(10^{exp})", lambda: fib_fast(n), repeat, 1)
+        report(f"fib_mod(10^{exp}, 10^9+7)", lambda: fib_mod(n, 10**9 + 7), repeat, 1)
+        exp += 1
+
+
+@lru_cache(maxsize=None)
+def lru_fib(n: int) -> int:
+    """The original unbounded ``lru_cache`` version of ``fib``."""
+    return n if n < 2 else lru_fib(n - 1) + lru_fib(n - 2)
+
+
+def bench_memo(n: int, repeat: int) -> None:
+    print(f"memoized fib, cold cache (n={n})")
+
+    def cold(f: Callable[[int], int]) -> Callable[[], int]:
+        def run() -> int:
+            f.cache_clear()  # type: ignore[attr-defined]
+            return f(n)
+
+        return run
+
+    try:
+        report("lru_cache(maxsize=None)", cold(lru_fib), repeat, n)
+    except RecursionError:
+        print("  lru_cache(maxsize=None)      RecursionError on a cold cache")
+    report("memoize(1024, bottom_up)", cold(fib), repeat, n)
+    print(f"  {fib.cache_info()}")
+
+    # Zipf-distributed argument stream; popularity is unrelated to the argument's size
+    rnd = random.Random(3)
+    keys = list(range(20_000))
+    rnd.shuffle(keys)
+    weights = [1 / (rank + 1) for rank in range(len(keys))]
+    stream = rnd.choices(keys, weights, k=50_000)
+    print(f"eviction policies, {len(stream)} Zipf calls of fib_fast over 20k keys, 500 entries")
+    for policy in ("lru", "lfu", "size"):
+        cached = memoize(500, policy=policy)(fib_fast)
+
+        def run() -> None:
+            cached.cache_clear()
+            for k in stream:
+                cached(k)
+
+        report(f"policy={policy!r}", run, repeat, len(stream))
+        info = cached.cache_info()
+        print(f"    hit ratio {info.hits / len(stream):.1%}, cached bytes {info.nbytes}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lab 4 microbenchmarks")
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--parallel-n", type=int, default=4_000_000)
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--fib-n", type=int, default=10_000_000)
+    parser.add_argument("--memo-n", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+    bench_sort(args.n, args.repeat)
+    bench_parallel(args.parallel_n, args.repeat)
+    bench_traversal(args.nodes, args.repeat)
+    bench_arraytree(args.nodes, args.repeat)
+    bench_avl(args.nodes, args.repeat)
+    bench_fib(args.fib_n, args.repeat)
+    bench_memo(args.memo_n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
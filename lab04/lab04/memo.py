@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import heapq
+import sys
+from collections import OrderedDict
+from functools import update_wrapper
+from itertools import count
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+R = TypeVar("R")
+Key = Tuple[Hashable, ...]
+
+POLICIES = ("lru", "lfu", "size")
+_MISSING: Any = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    max_bytes: Optional[int]
+    currsize: int
+    nbytes: int
+
+
+# ------------------- Eviction policies -------------------
+class _LRUStore:
+    """Evicts the least recently used entry."""
+
+    def __init__(self) -> None:
+        self._data: OrderedDict[Key, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Key) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Key, value: Any) -> None:
+        self._data[key] = value
+
+    def discard(self, key: Key) -> Any:
+        return self._data.pop(key, _MISSING)
+
+    def evict(self) -> Any:
+        return self._data.popitem(last=False)[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class _FreqNode:
+    """All keys used ``freq`` times, oldest first; a link in ``_LFUStore``'s frequency list."""
+
+    __slots__ = ("freq", "keys", "prev", "next")
+
+    def __init__(self, freq: int, prev: Optional[_FreqNode], nxt: Optional[_FreqNode]) -> None:
+        self.freq = freq
+        self.keys: OrderedDict[Key, None] = OrderedDict()
+        self.prev: _FreqNode = prev or self
+        self.next: _FreqNode = nxt or self
+
+
+class _LFUStore:
+    """Evicts the least frequently used entry (oldest first among equal counts), all O(1).
+
+    The frequencies in use form a doubly linked list of ``_FreqNode`` in increasing
+    order behind a sentinel, so the least used key is always ``_head.next.keys[0]``.
+    A key only moves from ``f`` to ``f + 1``: its new node, if any, goes right after
+    the old one and an emptied node is unlinked, so nothing is ever searched for.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[Key, Any] = {}
+        self._nodes: Dict[Key, _FreqNode] = {}
+        self._head = _FreqNode(0, None, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def _unlink(node: _FreqNode) -> None:
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    def get(self, key: Key) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            node = self._nodes[key]
+            f = node.freq + 1
+            nxt = node.next
+            if nxt.freq != f:
+                if len(node.keys) == 1:  # the key is alone: bump its node in place
+                    node.freq = f
+                    return value
+                nxt = _FreqNode(f, node, nxt)
+                node.next = nxt.next.prev = nxt
+            nxt.keys[key] = None
+            self._nodes[key] = nxt
+            del node.keys[key]
+            if not node.keys:
+                self._unlink(node)
+        return value
+
+    def put(self, key: Key, value: Any) -> None:
+        self._data[key] = value
+        head = self._head
+        node = head.next
+        if node.freq != 1:
+            node = _FreqNode(1, head, node)
+            head.next = node.next.prev = node
+        node.keys[key] = None
+        self._nodes[key] = node
+
+    def discard(self, key: Key) -> Any:
+        value = self._data.pop(key, _MISSING)
+        if value is not _MISSING:
+            node = self._nodes.pop(key)
+            del node.keys[key]
+            if not node.keys:
+                self._unlink(node)
+        return value
+
+    def evict(self) -> Any:
+        node = self._head.next
+        key, _ = node.keys.popitem(last=False)
+        if not node.keys:
+            self._unlink(node)
+        del self._nodes[key]
+        return self._data.pop(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._nodes.clear()
+        self._head = _FreqNode(0, None, None)
+
+
+class _SizeStore:
+    """Evicts the entry with the largest value (in ``sys.getsizeof`` bytes), oldest first.
+
+    Discarded entries stay in the heap and are skipped when they surface.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[Key, Any] = {}
+        self._heap: List[Tuple[int, int, Key]] = []
+        self._live: Dict[Key, int] = {}  # key -> sequence number of its heap entry
+        self._seq = count()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Key) -> Any:
+        return self._data.get(key, _MISSING)
+
+    def put(self, key: Key, value: Any) -> None:
+        self._data[key] = value
+        seq = self._live[key] = next(self._seq)
+        heapq.heappush(self._heap, (-sys.getsizeof(value), seq, key))
+
+    def discard(self, key: Key) -> Any:
+        self._live.pop(key, None)
+        return self._data.pop(key, _MISSING)
+
+    def evict(self) -> Any:
+        while True:
+            _, seq, key = heapq.heappop(self._heap)
+            if self._live.get(key) == seq:
+                del self._live[key]
+                return self._data.pop(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._heap.clear()
+        self._live.clear()
+
+
+_Store = Union[_LRUStore, _LFUStore, _SizeStore]
+_STORES: Dict[str, Callable[[], _Store]] = {"lru": _LRUStore, "lfu": _LFUStore, "size": _SizeStore}
+
+
+# ------------------- Memoizing wrapper -------------------
+class Memoized(Generic[R]):
+    """Callable wrapper produced by ``memoize``; see there for the options."""
+
+    # set by update_wrapper
+    __name__: str
+    __wrapped__: Callable[..., R]
+
+    def __init__(
+        self,
+        fn: Callable[..., R],
+        maxsize: Optional[int],
+        policy: str,
+        max_bytes: Optional[int],
+        bottom_up: Optional[Callable[..., Iterable[Key]]],
+    ) -> None:
+        self._fn = fn
+        self._maxsize = maxsize
+        self._max_bytes = max_bytes
+        self._policy = policy
+        self._store = _STORES[policy]()
+        self._bottom_up = bottom_up
+        self._depth = 0
+        self._nbytes = 0
+        self._hits = self._misses = self._evictions = 0
+        update_wrapper(self, fn)
+
+    def __call__(self, *args: Hashable) -> R:
+        value = self._store.get(args)
+        if value is not _MISSING:
+            self._hits += 1
+            return value  # type: ignore[no-any-return]
+        self._misses += 1
+        self._depth += 1
+        try:
+            if self._bottom_up is not None and self._depth == 1:
+                # fill the cache from small arguments up, so each step recurses only briefly
+                for step in self._bottom_up(*args):
+                    self(*step)
+                # the steps may have reached ``args`` itself
+                value = self._store.get(args)
+                if value is not _MISSING:
+                    return value  # type: ignore[no-any-return]
+            value = self._fn(*args)
+        finally:
+            self._depth -= 1
+        self._store_value(args, value)
+        return value  # type: ignore[no-any-return]
+
+    def _store_value(self, key: Key, value: Any) -> None:
+        if self._maxsize is not None and self._maxsize <= 0:
+            return
+        store = self._store
+        old = store.discard(key)  # a replaced entry gives back its bytes
+        if old is not _MISSING:
+            self._nbytes -= sys.getsizeof(old)
+        size = sys.getsizeof(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        while len(store) and (
+            (self._maxsize is not None and len(store) >= self._maxsize)
+            or (self._max_bytes is not None and self._nbytes + size > self._max_bytes)
+        ):
+            victim = store.evict()
+            self._evictions += 1
+            self._nbytes -= sys.getsizeof(victim)
+        store.put(key, value)
+        self._nbytes += size
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self._hits,
+            self._misses,
+            self._evictions,
+            self._maxsize,
+            self._max_bytes,
+            len(self._store),
+            self._nbytes,
+        )
+
+    def cache_clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._store.clear()
+        self._nbytes = 0
+        self._hits = self._misses = self._evictions = 0
+
+    def cache_warm(self, calls: Iterable[Key]) -> None:
+        """Call the function on each argument tuple in order, smallest first."""
+        for args in calls:
+            self(*args)
+
+    def __repr__(self) -> str:
+        return f"<memoized {self._fn.__qualname__} policy={self._policy!r}>"
+
+
+def memoize(
+    maxsize: Optional[int] = 128,
+    *,
+    policy: str = "lru",
+    max_bytes: Optional[int] = None,
+    bottom_up: Optional[Callable[..., Iterable[Key]]] = None,
+) -> Callable[[Callable[..., R]], Memoized[R]]:
+    """Bounded, instrumented replacement for ``functools.lru_cache``.
+
+    The cache holds at most ``maxsize`` entries (``None`` = no limit) and, if
+    ``max_bytes`` is set, at most that many bytes of values measured with
+    ``sys.getsizeof`` (the size of a big integer grows with its digits).
+    When a limit is hit, ``policy`` picks the victim: ``"lru"`` (least recently
+    used), ``"lfu"`` (least frequently used) or ``"size"`` (largest value).
+    Arguments must be hashable and positional.
+
+    ``bottom_up(*args)`` may return argument tuples to compute, in order,
+    before an outermost cache miss; for a recursion like ``fib`` this fills
+    the cache from the bottom so a cold call never recurses deeply. It relies
+    on the freshly filled entries surviving eviction, which holds for
+    ``"lru"`` with a capacity larger than the step between arguments.
+
+    The wrapper exposes ``cache_info()`` (hits, misses, evictions, sizes),
+    ``cache_clear()`` and ``cache_warm(calls)``.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}; expected one of {POLICIES}")
+
+    def decorate(fn: Callable[..., R]) -> Memoized[R]:
+        return Memoized(fn, maxsize, policy, max_bytes, bottom_up)
+
+    return decorate
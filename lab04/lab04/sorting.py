@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Partitions this small are finished with insertion sort.
+_SMALL = 16
+# Above this size the pivot is Tukey's ninther instead of a median of three.
+_NINTHER = 128
+
+
+# ------------------- Introsort (in place on one buffer) -------------------
+def introsort(xs: Iterable[T], key: Optional[Callable[[T], Any]] = None) -> List[T]:
+    """Sorted copy of ``xs`` built by an in-place introsort on a single scratch list.
+
+    Quicksort with median-of-three / ninther pivots and Hoare partitioning;
+    partitions of ``_SMALL`` elements or fewer are finished by insertion sort,
+    and a range that exceeds ``2 * log2(n)`` partitioning levels falls back to
+    heapsort, so the worst case is O(n log n). The smaller side is handled
+    first and the larger one is deferred on an explicit stack, so the extra
+    memory is O(log n). Without ``key`` the sort is not stable; with ``key``
+    the buffer holds ``(key(x), index)`` pairs, which makes it stable.
+    """
+    if key is None:
+        buf: List[Any] = list(xs)
+        _sort_range(buf, 0, len(buf), 2 * len(buf).bit_length())
+        return buf
+    items = list(xs)
+    dec = [(key(x), i) for i, x in enumerate(items)]
+    _sort_range(dec, 0, len(dec), 2 * len(dec).bit_length())
+    return [items[i] for _, i in dec]
+
+
+def _sort_range(a: List[Any], lo: int, hi: int, depth: int) -> None:
+    """Sort ``a[lo:hi]`` in place; ``depth`` is the partitioning budget."""
+    stack = [(lo, hi, depth)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > _SMALL:
+            if depth == 0:
+                _heapsort(a, lo, hi)
+                break
+            depth -= 1
+            split = _partition(a, lo, hi)
+            if split - lo < hi - split:
+                stack.append((split, hi, depth))
+                hi = split
+            else:
+                stack.append((lo, split, depth))
+                lo = split
+        else:
+            _insertion_sort(a, lo, hi)
+
+
+def _median3(a: List[Any], i: int, j: int, k: int) -> int:
+    if a[i] < a[j]:
+        if a[j] < a[k]:
+            return j
+        return k if a[i] < a[k] else i
+    if a[i] < a[k]:
+        return i
+    return k if a[j] < a[k] else j
+
+
+def _partition(a: List[Any], lo: int, hi: int) -> int:
+    """Hoare partition around a sampled pivot; returns ``s`` with ``a[lo:s] <= a[s:hi]``."""
+    last = hi - 1
+    mid = lo + (hi - lo) // 2
+    if hi - lo > _NINTHER:
+        step = (hi - lo) // 8
+        m = _median3(
+            a,
+            _median3(a, lo, lo + step, lo + 2 * step),
+            _median3(a, mid - step, mid, mid + step),
+            _median3(a, last - 2 * step, last - step, last),
+        )
+    else:
+        m = _median3(a, lo, mid, last)
+    # with the pivot at a[lo] both sides are guaranteed to be non-empty
+    a[lo], a[m] = a[m], a[lo]
+    p = a[lo]
+    i, j = lo - 1, hi
+    while True:
+        i += 1
+        while a[i] < p:
+            i += 1
+        j -= 1
+        while p < a[j]:
+            j -= 1
+        if i >= j:
+            return j + 1
+        a[i], a[j] = a[j], a[i]
+
+
+def _insertion_sort(a: List[Any], lo: int, hi: int) -> None:
+    for i in range(lo + 1, hi):
+        x = a[i]
+        j = i - 1
+        while j >= lo and x < a[j]:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = x
+
+
+def _heapsort(a: List[Any], lo: int, hi: int) -> None:
+    n = hi - lo
+    for start in range(n // 2 - 1, -1, -1):
+        _sift_down(a, lo, start, n)
+    for end in range(n - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        _sift_down(a, lo, 0, end)
+
+
+def _sift_down(a: List[Any], lo: int, root: int, n: int) -> None:
+    x = a[lo + root]
+    while True:
+        child = 2 * root + 1
+        if child >= n:
+            break
+        if child + 1 < n and a[lo + child] < a[lo + child + 1]:
+            child += 1
+        if not x < a[lo + child]:
+            break
+        a[lo + root] = a[lo + child]
+        root = child
+    a[lo + root] = x
@@ -1,6 +1,45 @@
+from __future__ import annotations
+
+import random
 import sys
 from pathlib import Path
+from typing import Callable, Optional
+
+import pytest
 
 ROOT = Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from lab04.algorithms import Node  # noqa: E402
+
+
+def make_random_tree(n: int, seed: int, *, random_keys: bool = False) -> Optional[Node]:
+    """Random-shaped tree of ``n`` nodes, reproducible from ``seed``.
+
+    Every key is placed by a random left/right descent, so shapes range from
+    bushy to skewed. Keys are ``0..n-1`` in insertion order, or with
+    ``random_keys`` draws from -1000..1000 (duplicates allowed).
+    """
+    rnd = random.Random(seed)
+    root: Optional[Node] = None
+    for i in range(n):
+        key = rnd.randint(-1000, 1000) if random_keys else i
+        if root is None:
+            root = Node(key)
+            continue
+        cur = root
+        while True:
+            side = "left" if rnd.random() < 0.5 else "right"
+            child = getattr(cur, side)
+            if child is None:
+                setattr(cur, side, Node(key))
+                break
+            cur = child
+    return root
+
+
+@pytest.fixture()
+def random_tree() -> Callable[..., Optional[Node]]:
+    """``make_random_tree`` for tests that compare traversals on many shapes."""
+    return make_random_tree
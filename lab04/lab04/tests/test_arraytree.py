@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional, cast
+
+import pytest
+
+from lab04.algorithms import Node, bfs_level_order, dfs_preorder_iter, traverse
+from lab04.arraytree import NIL, ArrayTree
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_traversals_match_linked_tree(
+    seed: int, random_tree: Callable[..., Optional[Node]]
+) -> None:
+    t = random_tree(300, seed, random_keys=True)
+    at = ArrayTree(t)
+    assert len(at) == 300 and at.nbytes() == 3 * 8 * 300
+    for order in ("pre", "in", "post"):
+        expected = list(traverse(t, order))
+        assert at.traverse(order) == expected
+        assert list(getattr(at, f"{order}order")()) == expected
+    assert at.bfs_level_order() == bfs_level_order(t)
+    assert at.dfs_preorder_iter() == dfs_preorder_iter(t)
+    assert at.to_node() == t
+
+
+def test_layout_is_preorder_and_read_only() -> None:
+    #      4
+    #     / \
+    #    2   6
+    #   / \   \
+    #  1   3   7
+    at = ArrayTree(Node(4, left=Node(2, Node(1), Node(3)), right=Node(6, None, Node(7))))
+    assert list(at.keys) == [4, 2, 1, 3, 6, 7]
+    assert list(at.left) == [1, 2, NIL, NIL, NIL, NIL]
+    assert list(at.right) == [4, 3, NIL, NIL, 5, NIL]
+    with pytest.raises(TypeError):
+        cast(Any, at.keys)[0] = 0
+    with pytest.raises(ValueError):
+        at.traverse("level")
+
+
+def test_empty_and_degenerate_trees() -> None:
+    empty = ArrayTree()
+    assert len(empty) == 0 and empty.to_node() is None
+    assert empty.traverse("post") == empty.bfs_level_order() == list(empty.inorder()) == []
+
+    chain: Optional[Node] = None
+    for key in range(50_000):
+        chain = Node(key, left=chain)
+    at = ArrayTree(chain)
+    assert at.traverse("in") == list(at.inorder()) == list(range(50_000))
+    assert list(at.postorder()) == list(range(50_000))
+    assert at.to_node() is not None
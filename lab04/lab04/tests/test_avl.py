@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+import pytest
+
+from lab04.algorithms import Node, bfs_level_order, inorder, preorder, quicksort, traverse
+from lab04.avl import AVLNode, AVLTree
+
+
+def check_avl(n: Optional[Node]) -> int:
+    """Height of ``n``, asserting stored heights and the AVL balance condition."""
+    if n is None:
+        return 0
+    assert isinstance(n, AVLNode)
+    if n.left is not None:
+        assert n.left.key < n.key
+    if n.right is not None:
+        assert n.right.key > n.key
+    hl, hr = check_avl(n.left), check_avl(n.right)
+    assert abs(hl - hr) <= 1
+    assert n.height == max(hl, hr) + 1
+    return n.height
+
+
+def test_random_inserts_and_deletes_match_a_set() -> None:
+    rnd = random.Random(0)
+    tree, model = AVLTree(), set()
+    for _ in range(4000):
+        key = rnd.randint(0, 500)
+        if rnd.random() < 0.6:
+            assert tree.insert(key) == (key not in model)
+            model.add(key)
+        else:
+            assert tree.delete(key) == (key in model)
+            model.discard(key)
+        assert len(tree) == len(model)
+    check_avl(tree.root)
+    assert list(tree) == sorted(model)
+    assert all((k in tree) == (k in model) for k in range(-5, 510))
+    found = tree.search(min(model))
+    assert found is not None and found.key == min(model)
+
+
+def test_bulk_load_is_balanced_and_works_with_node_traversals() -> None:
+    rnd = random.Random(1)
+    xs = [rnd.randint(0, 10_000) for _ in range(5000)]
+    tree = AVLTree.bulk_load(quicksort(xs))
+    assert tree.root is not None
+    assert len(tree) == len(set(xs))
+    assert check_avl(tree.root) == tree.height <= len(tree).bit_length()
+    assert list(inorder(tree.root)) == traverse(tree.root) == sorted(set(xs))
+    assert next(preorder(tree.root)) == tree.root.key
+    assert len(bfs_level_order(tree.root)) == len(tree)
+    tree.insert(-1)
+    tree.delete(sorted(set(xs))[100])
+    check_avl(tree.root)
+    with pytest.raises(ValueError):
+        AVLTree.bulk_load([1, 3, 2])
+    assert AVLTree.bulk_load([]).root is None
+
+
+def test_sequential_inserts_stay_logarithmic() -> None:
+    tree = AVLTree(range(100_000))
+    assert tree.height <= 1.45 * 17  # AVL bound ~1.44 log2(n)
+    for key in range(0, 100_000, 2):
+        tree.delete(key)
+    check_avl(tree.root)
+    assert list(tree) == list(range(1, 100_000, 2))
+
+
+@pytest.mark.parametrize(
+    "lo, hi", [(None, None), (10, 20), (11, 11), (-5, 3), (95, None), (None, 0), (50, 10)]
+)
+def test_range_iter_is_half_open_and_lazy(lo: Optional[int], hi: Optional[int]) -> None:
+    keys = list(range(0, 100, 3))
+    tree = AVLTree.bulk_load(keys)
+    expected = [k for k in keys if (lo is None or k >= lo) and (hi is None or k < hi)]
+    assert list(tree.range_iter(lo, hi)) == expected
+    it = tree.range_iter(10)
+    assert next(it) == 12 and next(it) == 15
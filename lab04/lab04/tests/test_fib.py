@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from lab04.algorithms import fib, fib_iter
+import pytest
+
+from lab04.algorithms import fib, fib_fast, fib_iter, fib_mod, fib_pair
 
 
 def test_fib_small() -> None:
@@ -17,3 +19,22 @@ def test_fib_iter_matches() -> None:
 def test_cache_clear() -> None:
     fib.cache_clear()
     assert fib(0) == 0
+
+
+def test_fib_fast_and_mod_match_fib_iter() -> None:
+    for n in list(range(200)) + [1000, 4095, 4096, 12345]:
+        expected = fib_iter(n)
+        assert fib_fast(n) == expected
+        assert fib_pair(n) == (expected, fib_iter(n + 1))
+        for mod in (1, 2, 10, 10**9 + 7, 2**64):
+            assert fib_mod(n, mod) == expected % mod
+
+
+def test_fib_fast_large_and_errors() -> None:
+    # F(10^5) has 20899 digits; known last digits 746875
+    assert fib_fast(100_000) % 10**6 == 746875 == fib_mod(100_000, 10**6)
+    assert fib_mod(10**18, 10**9 + 7) == fib_mod(10**18 % (2 * (10**9 + 8)), 10**9 + 7)
+    with pytest.raises(ValueError):
+        fib_fast(-1)
+    with pytest.raises(ValueError):
+        fib_mod(5, 0)
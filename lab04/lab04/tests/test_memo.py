@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import random
+import sys
+from typing import Dict, List, Tuple
+
+import pytest
+
+from lab04.algorithms import fib, fib_fast
+from lab04.memo import _MISSING, Memoized, _LFUStore, memoize
+
+
+def recording(policy: str, maxsize: int) -> Tuple[List[int], Memoized[int]]:
+    calls: List[int] = []
+
+    @memoize(maxsize, policy=policy)
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    return calls, square
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    calls, square = recording("lru", 2)
+    for x in (1, 2, 1, 3, 1, 2):  # 3 evicts 2 (1 was used more recently), then 2 evicts 3
+        square(x)
+    assert calls == [1, 2, 3, 2]
+    info = square.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (2, 4, 2, 2)
+
+
+def test_lfu_evicts_least_frequently_used() -> None:
+    calls, square = recording("lfu", 2)
+    for x in (1, 1, 1, 2, 3, 2, 1):
+        square(x)
+    # 3 evicts 2 (1 use vs 3), 2 then evicts 3; 1 stays cached throughout
+    assert calls == [1, 2, 3, 2]
+
+
+def test_lfu_store_matches_a_naive_model() -> None:
+    rnd = random.Random(7)
+    store = _LFUStore()
+    model: Dict[int, List[int]] = {}  # key -> [frequency, insertion tick]
+    for tick in range(3000):
+        key, op = rnd.randrange(12), rnd.random()
+        if op < 0.5:
+            assert store.get((key,)) == (key if key in model else _MISSING)
+            if key in model:
+                model[key] = [model[key][0] + 1, tick]
+        elif op < 0.8:
+            store.discard((key,))  # may empty the lowest bucket
+            model.pop(key, None)
+            store.put((key,), key)
+            model[key] = [1, tick]
+        elif op < 0.9 and model:
+            victim = min(model, key=lambda k: model[k])
+            assert store.evict() == victim
+            del model[victim]
+        else:
+            expected = key if model.pop(key, None) is not None else _MISSING
+            assert store.discard((key,)) == expected
+        assert len(store) == len(model)
+
+
+def test_size_policy_and_byte_budget() -> None:
+    budget = sys.getsizeof(10**100) + 3 * sys.getsizeof(1)
+
+    @memoize(None, policy="size", max_bytes=budget)
+    def power(e: int) -> int:
+        return 10**e
+
+    for e in (1, 100, 2, 3, 4):
+        power(e)
+    info = power.cache_info()
+    assert (info.misses, info.evictions, info.currsize) == (5, 1, 4)
+    assert info.nbytes <= budget
+    power(3)  # the small values survived, the 100-digit one was evicted first
+    power(100)
+    assert power.cache_info().hits == 1
+
+    power(10**5)  # larger than the whole budget: returned but not cached
+    assert power.cache_info().nbytes <= budget
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu", "size"])
+def test_bottom_up_reaching_the_requested_args_stores_them_once(policy: str) -> None:
+    calls: List[int] = []
+
+    @memoize(4, policy=policy, bottom_up=lambda n: ((k,) for k in range(0, n + 1)))
+    def power(e: int) -> int:
+        calls.append(e)
+        return 10**e
+
+    for n in (10, 20, 30):
+        assert power(n) == 10**n
+    assert calls.count(30) == 1  # not recomputed after the ladder reached it
+    info = power.cache_info()
+    assert info.currsize == 4 and info.nbytes <= 4 * sys.getsizeof(10**30)
+    power._store_value((30,), 10**30)  # storing a cached key again replaces it
+    assert power.cache_info()[3:] == info[3:]
+    if policy == "lru":  # the last four steps are cached and counted once each
+        assert info.nbytes == sum(sys.getsizeof(10**e) for e in range(27, 31))
+        power.cache_warm((e,) for e in range(27, 31))
+        assert power.cache_info().hits == info.hits + 4
+
+
+def test_clear_warm_and_metadata() -> None:
+    calls, square = recording("lru", 0)  # maxsize=0 caches nothing
+    square(2)
+    square(2)
+    assert calls == [2, 2]
+
+    @memoize(maxsize=None)
+    def triple(x: int) -> int:
+        """Triple x."""
+        return 3 * x
+
+    triple.cache_warm((x,) for x in range(10))
+    assert triple.cache_info().currsize == 10 and triple(4) == 12
+    assert triple.cache_info().hits == 1
+    triple.cache_clear()
+    assert triple.cache_info() == (0, 0, 0, None, None, 0, 0)
+    assert triple.__name__ == "triple" and triple.__doc__ == "Triple x."
+    with pytest.raises(ValueError):
+        memoize(policy="fifo")
+
+
+def test_cold_fib_is_bounded_and_does_not_overflow_the_stack() -> None:
+    fib.cache_clear()
+    n = 50 * sys.getrecursionlimit()
+    assert fib(n) == fib_fast(n)
+    info = fib.cache_info()
+    assert info.maxsize is not None and info.currsize <= info.maxsize
+    assert info.evictions > 0
+    fib.cache_clear()
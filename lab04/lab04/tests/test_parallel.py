@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from lab04 import parallel
+from lab04.parallel import parallel_sort
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_parallel_sort_matches_sorted(use_numpy: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not use_numpy:
+        monkeypatch.setattr(parallel, "np", None)
+    rnd = random.Random(0)
+    for xs in (
+        [rnd.randint(-(2**63), 2**63 - 1) for _ in range(20_000)],
+        [rnd.randint(0, 3) for _ in range(10_001)],  # heavy duplicates around the splitters
+        list(range(5000, 0, -1)),
+    ):
+        out = parallel_sort(xs, workers=3, min_size=0)
+        assert out.typecode == "q"
+        assert list(out) == sorted(xs)
+
+
+def test_parallel_sort_small_inputs_and_errors() -> None:
+    assert list(parallel_sort([])) == []
+    assert list(parallel_sort([3, 1, 2], workers=4, min_size=0)) == [1, 2, 3]
+    for workers in (0, -1):
+        with pytest.raises(ValueError):
+            parallel_sort([1], workers=workers)
+    with pytest.raises(OverflowError):
+        parallel_sort([2**63])
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import random
+from typing import List
+
+import pytest
+
+from lab04.sorting import _sort_range, introsort
+
+
+def inputs(n: int) -> List[List[int]]:
+    rnd = random.Random(n)
+    return [
+        [rnd.randint(-(10**6), 10**6) for _ in range(n)],
+        [rnd.randint(0, 3) for _ in range(n)],
+        list(range(n)),
+        list(range(n, 0, -1)),
+        [min(i, n - i) for i in range(n)],  # organ pipe
+        [7] * n,
+    ]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 15, 16, 17, 129, 1000, 20_000])
+def test_introsort_matches_sorted(n: int) -> None:
+    for xs in inputs(n):
+        original = xs[:]
+        assert introsort(xs) == sorted(xs)
+        assert xs == original  # input is not mutated
+
+
+def test_introsort_key_is_stable() -> None:
+    rnd = random.Random(1)
+    words = [f"{rnd.choice('abc')}{i}" for i in range(3000)]
+    assert introsort(words, key=lambda w: w[0]) == sorted(words, key=lambda w: w[0])
+    assert introsort(iter(range(100)), key=lambda x: -x) == list(range(99, -1, -1))
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_heapsort_fallback(depth: int) -> None:
+    xs = [random.Random(depth).randint(0, 500) for _ in range(5000)]
+    buf = xs[:]
+    _sort_range(buf, 0, len(buf), depth)
+    assert buf == sorted(xs)
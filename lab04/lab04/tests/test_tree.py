@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from array import array
+from typing import Callable, List, Optional
+
+import pytest
+
 from lab04.algorithms import (
     Node,
     bfs_level_order,
@@ -7,6 +12,7 @@ from lab04.algorithms import (
     inorder,
     postorder,
     preorder,
+    traverse,
 )
 
 
@@ -26,3 +32,43 @@ def test_traversals() -> None:
     assert list(postorder(t)) == [1, 3, 2, 7, 6, 4]
     assert bfs_level_order(t) == [4, 2, 6, 1, 3, 7]
     assert dfs_preorder_iter(t) == [4, 2, 1, 3, 6, 7]
+
+
+def reference(t: Optional[Node], order: str) -> List[int]:
+    if t is None:
+        return []
+    left, right = reference(t.left, order), reference(t.right, order)
+    return {
+        "pre": [t.key] + left + right,
+        "in": left + [t.key] + right,
+        "post": left + right + [t.key],
+    }[order]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_generators_and_batched_traverse_agree(
+    seed: int, random_tree: Callable[..., Optional[Node]]
+) -> None:
+    t = random_tree(200, seed)
+    for order, gen in (("pre", preorder), ("in", inorder), ("post", postorder)):
+        expected = reference(t, order)
+        assert list(gen(t)) == expected
+        assert traverse(t, order) == expected
+        assert list(traverse(t, order, array("q", [-1]))) == [-1] + expected
+    assert traverse(None, "post") == [] and list(inorder(None)) == []
+
+
+def test_degenerate_trees_do_not_hit_the_recursion_limit() -> None:
+    n = 100_000
+    left_chain: Optional[Node] = None
+    right_chain: Optional[Node] = None
+    for key in range(n):
+        left_chain = Node(key, left=left_chain)
+        right_chain = Node(n - 1 - key, right=right_chain)
+    keys = list(range(n))
+    assert list(inorder(left_chain)) == traverse(left_chain) == keys
+    assert list(postorder(left_chain)) == traverse(left_chain, "post") == keys
+    assert list(preorder(right_chain)) == traverse(right_chain, "pre") == keys
+    assert list(postorder(right_chain)) == keys[::-1]
+    with pytest.raises(ValueError):
+        traverse(left_chain, "level")
@@ -12,13 +12,31 @@ def naturals(start: int = 0, step: int = 1) -> Iterator[int]:
     # делегуємо в itertools.count заради ефективності
     yield from _count(start, step)
 
-def fib_stream() -> Iterator[int]:
-    """Нескінченний потік Фібоначчі: 0,1,1,2,3,5,..."""
+def _fib_pair(n: int) -> Tuple[int, int]:
+    """(F(n), F(n+1)) методом швидкого подвоєння — O(log n) множень замість n додавань."""
     a, b = 0, 1
+    for bit in bin(n)[2:]:
+        # (F(k), F(k+1)) -> (F(2k), F(2k+1)), а для одиничного біта ще на крок далі
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+def _fib_from(start: int) -> Iterator[int]:
+    a, b = _fib_pair(start)
     while True:
         yield a
         a, b = b, a + b
 
+def fib_stream(start: int = 0) -> Iterator[int]:
+    """Нескінченний потік Фібоначчі: F(start), F(start+1), ... (за замовчуванням 0,1,1,2,3,5,...).
+    Перехід до позиції start коштує O(log start) множень, а не start кроків потоку.
+    Звичайна функція, а не генератор: від'ємний start відхиляється одразу під час виклику.
+    """
+    if start < 0:
+        raise ValueError("start має бути невід'ємним")
+    return _fib_from(start)
+
 # --------- Взяття / Пропуск ---------
 def take(n: int, it: Iterable[T]) -> list[T]:
     """Повернути список із перших n елементів iterable. Якщо n <= 0 -> []."""
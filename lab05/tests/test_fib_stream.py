@@ -1,5 +1,21 @@
 from itertools import islice
+import pytest
 from streams import fib_stream
 
 def test_first_10_fib():
     assert list(islice(fib_stream(), 10)) == [0,1,1,2,3,5,8,13,21,34]
+
+def test_fib_stream_seek_matches_drop():
+    for start in [0, 1, 2, 7, 64, 1000]:
+        expected = list(islice(fib_stream(), start, start + 5))
+        assert list(islice(fib_stream(start), 5)) == expected
+
+def test_fib_stream_large_offset():
+    # F(10^5) закінчується на ...746875, а F(n+2) = F(n+1) + F(n)
+    a, b, c = islice(fib_stream(100_000), 3)
+    assert a % 10**6 == 746875 and c == a + b
+
+def test_fib_stream_negative_start():
+    # помилка під час виклику, а не на першому next()
+    with pytest.raises(ValueError):
+        fib_stream(-1)
@@ -10,7 +10,7 @@
 
 from __future__ import annotations
 
-from functools import partial, reduce, singledispatch, total_ordering
+from functools import partial, singledispatch, total_ordering
 from operator import itemgetter, attrgetter, methodcaller
 from pathlib import Path
 from typing import Any, Iterable, Callable, Dict, List
@@ -34,8 +34,13 @@ strip, lower, title = methodcaller("strip"), methodcaller("lower"), methodcaller
 # ===========================
 
 def pipeline(value: Any, *funcs: Callable[[Any], Any]) -> Any:
-    """Проганяє value через послідовність функцій."""
-    return reduce(lambda acc, f: f(acc), funcs, value)
+    """Проганяє value через послідовність функцій.
+
+    Простий цикл замість ``reduce`` з лямбдою: без зайвого виклику лямбди на кожен крок.
+    """
+    for f in funcs:
+        value = f(value)
+    return value
 
 
 def mapf(fn: Callable[[Any], Any]) -> Callable[[Iterable[Any]], Iterable[Any]]:
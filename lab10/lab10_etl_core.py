@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Iterable, Iterator, Callable, TypedDict, TypeAlias, Any, List, Dict
-from functools import reduce
 from operator import methodcaller
 import re
 
@@ -43,10 +42,17 @@ def and_then(r: Result, fn: Callable[[Any], Result]) -> Result:
     return fn(r.value) if isinstance(r, Ok) else r
 
 def compose(*funcs: Callable[[Any], Any]) -> Callable[[Any], Any]:
-    return lambda x: reduce(lambda acc, f: f(acc), reversed(funcs), x)
+    chain = funcs[::-1]  # порядок виклику фіксуємо один раз, а не на кожен виклик
+    def _c(x: Any) -> Any:
+        for f in chain:
+            x = f(x)
+        return x
+    return _c
 
 def pipeline(value: Any, *funcs: Callable[[Any], Any]) -> Any:
-    return reduce(lambda acc, f: f(acc), funcs, value)
+    for f in funcs:
+        value = f(value)
+    return value
 
 strip = methodcaller("strip")
 lower = methodcaller("lower")